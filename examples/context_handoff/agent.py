@@ -11,10 +11,79 @@ Key solution: Structured context passing with validation and error handling.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, Any, List, Optional, Callable
+from typing import (
+    Dict, Any, List, Optional, Callable, Iterable, Tuple, Set, AsyncIterator,
+    ClassVar, Deque, Mapping, NamedTuple
+)
+from types import MappingProxyType
+from collections import deque
 from enum import Enum
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+import asyncio
+import inspect
+import io
+import itertools
 import json
+import logging
+import string
+import sys
+import threading
+import time
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode read-only mappings (frozen handoffs) as objects, anything else as str."""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    return str(obj)
+
+
+try:
+    import orjson
+    
+    def _dumps(obj: Any) -> str:
+        """Serialize to indented JSON with orjson (C-accelerated)."""
+        return orjson.dumps(
+            obj,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            default=_json_default
+        ).decode()
+    
+    def _encode(obj: Any) -> bytes:
+        """Serialize to compact JSON bytes with orjson."""
+        return orjson.dumps(
+            obj, option=orjson.OPT_NON_STR_KEYS, default=_json_default
+        )
+    
+    _decode = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    def _dumps(obj: Any) -> str:
+        """Serialize to indented JSON with the stdlib encoder."""
+        return json.dumps(obj, indent=2, default=_json_default)
+    
+    def _encode(obj: Any) -> bytes:
+        """Serialize to compact JSON bytes with the stdlib encoder."""
+        return json.dumps(
+            obj, separators=(",", ":"), default=_json_default
+        ).encode()
+    
+    _decode = json.loads
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; statistics fall back to builtins
+    np = None
+
+
+logger = logging.getLogger(__name__)
+
+# dataclass(slots=True) needs Python 3.10+; older versions keep __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Guards Context._record and revision bumps: in graph mode, nodes using the
+# default execute_async run in worker threads concurrently. Module-level so
+# contexts stay plain data for asdict, copy and pickle.
+_CONTEXT_LOCK = threading.Lock()
 
 
 class PipelineStage(Enum):
@@ -26,7 +95,55 @@ class PipelineStage(Enum):
     COMPLETE = "complete"
 
 
-@dataclass
+# O(1) value -> member lookup for deserialization; Enum.__call__ is slower
+_STAGE_BY_VALUE = {stage.value: stage for stage in PipelineStage}
+
+
+# Context fields whose reassignment invalidates cached serializations
+_TRACKED_FIELDS = frozenset({
+    "query",
+    "raw_data",
+    "validated_data",
+    "analysis_results",
+    "final_report",
+    "current_stage",
+    "start_time_ns",
+})
+
+
+class StageRecord(NamedTuple):
+    """
+    One entry of `Context.stage_history`.
+    
+    Kept as a tuple rather than a dict so long histories stay compact;
+    `Context.to_dict()` expands records into dicts only when serializing.
+    """
+    stage: str
+    node: str
+    success: bool
+    errors: List[str]
+    ts_ns: int
+
+
+# Naive UTC: serialized timestamps read like datetime.utcnow().isoformat()
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _ns_to_iso(ts_ns: int) -> str:
+    """Format an epoch-nanosecond timestamp as a naive UTC ISO-8601 string."""
+    return (_EPOCH + (ts_ns // 1000) * _MICROSECOND).isoformat()
+
+
+def _iso_to_ns(value: str) -> int:
+    """Parse an ISO-8601 timestamp (naive values are UTC) to epoch nanoseconds."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return (parsed - _EPOCH) // _MICROSECOND * 1000
+
+
+@dataclass(**_SLOTS)
 class Context:
     """
     Structured context that flows through the pipeline.
@@ -36,6 +153,10 @@ class Context:
     - Each stage can see previous stages' outputs
     - Validation ensures required fields are present
     - Metadata tracks execution history
+    
+    Serialized forms are cached and invalidated whenever a field is
+    reassigned, so stages should replace their outputs rather than
+    mutate them in place.
     """
     # Input data
     query: str
@@ -48,24 +169,135 @@ class Context:
     
     # Execution metadata
     current_stage: PipelineStage = PipelineStage.DATA_COLLECTION
-    stage_history: List[Dict[str, Any]] = field(default_factory=list)
+    stage_history: List[StageRecord] = field(default_factory=list)
     errors: List[str] = field(default_factory=list)
-    start_time: datetime = field(default_factory=datetime.utcnow)
+    start_time_ns: int = field(default_factory=time.time_ns)
+    
+    # Serialization caches, keyed by the revision they were built at
+    _rev: int = field(default=0, init=False, repr=False, compare=False)
+    _json_cache: Dict[str, Tuple[int, str]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _dict_cache: Optional[Tuple[Tuple[int, int, int], Dict[str, Any]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    # Free-list of released contexts reused by `acquire`
+    _pool: ClassVar[Deque['Context']] = deque(maxlen=256)
+    
+    @classmethod
+    def acquire(cls, query: str) -> 'Context':
+        """Return a fresh-looking context, reusing a released one if available."""
+        try:
+            ctx = cls._pool.pop()
+        except IndexError:
+            return cls(query=query)
+        ctx._reset(query)
+        return ctx
+    
+    @classmethod
+    def release(cls, ctx: 'Context'):
+        """
+        Return a context to the pool once nothing references it any more.
+        
+        The context is reset on the next `acquire`; callers must not keep
+        using it (or lists obtained from it) after releasing.
+        """
+        cls._pool.append(ctx)
+    
+    def _reset(self, query: str):
+        """Reinitialize a pooled context for a new query."""
+        self.query = query
+        # Stage outputs may be dicts owned by data sources or analyzers,
+        # so rebind rather than clear them in place
+        if self.raw_data:
+            self.raw_data = {}
+        if self.validated_data:
+            self.validated_data = {}
+        if self.analysis_results:
+            self.analysis_results = {}
+        self.final_report = None
+        self.current_stage = PipelineStage.DATA_COLLECTION
+        # Collected results (e.g. `to_dict`) may still hold the old lists
+        self.stage_history = []
+        self.errors = []
+        self.start_time_ns = time.time_ns()
+        self._json_cache.clear()
+        self._dict_cache = None
+    
+    def __setattr__(self, name: str, value: Any):
+        object.__setattr__(self, name, value)
+        if name in _TRACKED_FIELDS:
+            with _CONTEXT_LOCK:
+                # _rev is not set yet while __init__ assigns the fields
+                object.__setattr__(self, "_rev", getattr(self, "_rev", 0) + 1)
+    
+    def _record(self, errors: List[str], history_entry: StageRecord):
+        """
+        Record one stage execution: its errors and its history entry.
+        
+        Stages report through this single mutation point instead of touching
+        `errors` and `stage_history` separately. Safe to call from several
+        threads at once.
+        """
+        with _CONTEXT_LOCK:
+            if errors:
+                self.errors.extend(errors)
+            self.stage_history.append(history_entry)
+            self._rev += 1
+    
+    def _json_cached(self, name: str) -> str:
+        """Return the indented JSON form of a field, reusing it until reassigned."""
+        cached = self._json_cache.get(name)
+        if cached is not None and cached[0] == self._rev:
+            return cached[1]
+        
+        text = _dumps(getattr(self, name))
+        self._json_cache[name] = (self._rev, text)
+        return text
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert context to dictionary for serialization."""
+        key = (self._rev, len(self.stage_history), len(self.errors))
+        if self._dict_cache is None or self._dict_cache[0] != key:
+            self._dict_cache = (key, {
+                "query": self.query,
+                "raw_data": dict(self.raw_data),
+                "validated_data": self.validated_data,
+                "analysis_results": self.analysis_results,
+                "final_report": self.final_report,
+                "current_stage": self.current_stage.value,
+                "stage_history": [
+                    self._history_entry_to_dict(entry) for entry in self.stage_history
+                ],
+                "errors": self.errors,
+                "start_time": _ns_to_iso(self.start_time_ns)
+            })
+        # Shallow copy so callers can't alter the cached dict
+        return dict(self._dict_cache[1])
+    
+    @staticmethod
+    def _history_entry_to_dict(entry: StageRecord) -> Dict[str, Any]:
+        """Expand a history record, formatting its timestamp as ISO-8601."""
         return {
-            "query": self.query,
-            "raw_data": self.raw_data,
-            "validated_data": self.validated_data,
-            "analysis_results": self.analysis_results,
-            "final_report": self.final_report,
-            "current_stage": self.current_stage.value,
-            "stage_history": self.stage_history,
-            "errors": self.errors,
-            "start_time": self.start_time.isoformat()
+            "stage": entry.stage,
+            "node": entry.node,
+            "success": entry.success,
+            "errors": entry.errors,
+            "timestamp": _ns_to_iso(entry.ts_ns)
         }
     
+    @staticmethod
+    def _history_entry_from_dict(entry: Dict[str, Any]) -> StageRecord:
+        """Inverse of `_history_entry_to_dict`."""
+        return StageRecord(
+            stage=entry["stage"],
+            node=entry["node"],
+            success=entry["success"],
+            errors=entry.get("errors", []),
+            ts_ns=_iso_to_ns(entry["timestamp"])
+        )
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Context':
         """Create context from dictionary."""
@@ -74,13 +306,35 @@ class Context:
         ctx.validated_data = data.get("validated_data", {})
         ctx.analysis_results = data.get("analysis_results", {})
         ctx.final_report = data.get("final_report")
-        ctx.current_stage = PipelineStage(data.get("current_stage", "data_collection"))
-        ctx.stage_history = data.get("stage_history", [])
+        stage_value = data.get("current_stage", "data_collection")
+        # Unknown values fall through to the Enum call, which raises ValueError
+        ctx.current_stage = _STAGE_BY_VALUE.get(stage_value) or PipelineStage(stage_value)
+        ctx.stage_history = [
+            cls._history_entry_from_dict(entry)
+            for entry in data.get("stage_history", [])
+        ]
         ctx.errors = data.get("errors", [])
+        if "start_time" in data:
+            ctx.start_time_ns = _iso_to_ns(data["start_time"])
         return ctx
+    
+    def to_json(self) -> bytes:
+        """
+        Encode the context as compact JSON bytes.
+        
+        This is the checkpoint / distributed-handoff format: it reuses the
+        cached `to_dict()` and goes straight to bytes without an
+        intermediate str.
+        """
+        return _encode(self.to_dict())
+    
+    @classmethod
+    def from_json(cls, data: bytes) -> 'Context':
+        """Decode a context produced by `to_json`."""
+        return cls.from_dict(_decode(data))
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class StageResult:
     """Result of executing a pipeline stage."""
     success: bool
@@ -90,6 +344,33 @@ class StageResult:
     execution_time_ms: float
 
 
+def _call_sync(func: Callable[[Any], Any], arg: Any) -> Any:
+    """Call a node callable from the sync path, rejecting async callables."""
+    result = func(arg)
+    if inspect.isawaitable(result):
+        if inspect.iscoroutine(result):
+            result.close()  # Avoid a "never awaited" warning
+        raise TypeError(f"{func!r} is async; run the pipeline with execute_async")
+    return result
+
+
+async def _call_async(func: Callable[[Any], Any], arg: Any, run_in_thread: bool) -> Any:
+    """
+    Call a node callable from the async path.
+    
+    Sync callables run inline unless ``run_in_thread`` is set, in which case
+    they are offloaded so CPU-bound work does not stall the event loop.
+    Awaitable results are awaited directly.
+    """
+    if run_in_thread and not inspect.iscoroutinefunction(func):
+        result = await asyncio.to_thread(func, arg)
+    else:
+        result = func(arg)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
 class PipelineNode:
     """
     Base class for pipeline nodes.
@@ -101,23 +382,33 @@ class PipelineNode:
     - Passes updated context to next node
     """
     
+    __slots__ = ("name", "stage", "_stage_value")
+    
     def __init__(self, name: str, stage: PipelineStage):
         self.name = name
         self.stage = stage
+        # Shared by every history record this node writes
+        self._stage_value = stage.value
     
     def execute(self, context: Context) -> StageResult:
         """Execute this node's task."""
         raise NotImplementedError
     
+    async def execute_async(self, context: Context) -> StageResult:
+        """
+        Execute this node's task without blocking the event loop.
+        
+        The default runs the synchronous `execute` in a worker thread so
+        custom nodes doing blocking I/O still overlap with other pipelines.
+        Nodes with natively async work override this.
+        """
+        return await asyncio.to_thread(self.execute, context)
+    
     def _log_execution(self, context: Context, success: bool, errors: List[str]):
-        """Log execution to context history."""
-        context.stage_history.append({
-            "stage": self.stage.value,
-            "node": self.name,
-            "success": success,
-            "errors": errors,
-            "timestamp": datetime.utcnow().isoformat()
-        })
+        """Log execution to context history and record any errors."""
+        context._record(errors, StageRecord(
+            self._stage_value, self.name, success, errors, time.time_ns()
+        ))
 
 
 class DataCollectionNode(PipelineNode):
@@ -131,44 +422,79 @@ class DataCollectionNode(PipelineNode):
     - Read files
     """
     
-    def __init__(self, data_source: Callable[[str], Dict[str, Any]]):
+    __slots__ = ("data_source", "run_in_thread")
+    
+    def __init__(
+        self,
+        data_source: Callable[[str], Dict[str, Any]],
+        run_in_thread: bool = False,
+    ):
         super().__init__("DataCollector", PipelineStage.DATA_COLLECTION)
         self.data_source = data_source
+        self.run_in_thread = run_in_thread
     
     def execute(self, context: Context) -> StageResult:
         """Collect raw data."""
-        print(f"📊 [{self.name}] Collecting data for: {context.query}")
+        logger.debug("📊 [%s] Collecting data for: %s", self.name, context.query)
         
         try:
             # Fetch data from source
-            raw_data = self.data_source(context.query)
-            
-            # Update context
-            context.raw_data = raw_data
-            context.current_stage = PipelineStage.VALIDATION
-            
-            self._log_execution(context, True, [])
-            
-            return StageResult(
-                success=True,
-                output=raw_data,
-                errors=[],
-                next_stage=PipelineStage.VALIDATION,
-                execution_time_ms=100.0  # Mock timing
-            )
-            
+            raw_data = _call_sync(self.data_source, context.query)
         except Exception as e:
-            error_msg = f"Data collection failed: {str(e)}"
-            context.errors.append(error_msg)
-            self._log_execution(context, False, [error_msg])
-            
-            return StageResult(
-                success=False,
-                output={},
-                errors=[error_msg],
-                next_stage=None,
-                execution_time_ms=0.0
+            return self._fail(context, e)
+        
+        return self._complete(context, raw_data)
+    
+    async def execute_async(self, context: Context) -> StageResult:
+        """
+        Collect raw data without blocking the event loop.
+        
+        Async sources are awaited directly; sync sources run inline, or in a
+        worker thread when ``run_in_thread`` is set. Either way the context is
+        only updated on the loop thread.
+        """
+        logger.debug("📊 [%s] Collecting data for: %s", self.name, context.query)
+        
+        try:
+            raw_data = await _call_async(
+                self.data_source, context.query, self.run_in_thread
             )
+        except Exception as e:
+            return self._fail(context, e)
+        
+        return self._complete(context, raw_data)
+    
+    def _complete(self, context: Context, raw_data: Dict[str, Any]) -> StageResult:
+        """Hand collected data to the next stage."""
+        # Update context; several collectors fanning into one validator
+        # contribute to a merged raw_data instead of overwriting each other
+        if context.raw_data:
+            raw_data = {**context.raw_data, **raw_data}
+        context.raw_data = raw_data
+        context.current_stage = PipelineStage.VALIDATION
+        
+        self._log_execution(context, True, [])
+        
+        return StageResult(
+            success=True,
+            output=raw_data,
+            errors=[],
+            next_stage=PipelineStage.VALIDATION,
+            execution_time_ms=100.0  # Mock timing
+        )
+    
+    def _fail(self, context: Context, error: Exception) -> StageResult:
+        """Record a data collection failure."""
+        error_msg = f"Data collection failed: {str(error)}"
+        self._log_execution(context, False, [error_msg])
+        
+        return StageResult(
+            success=False,
+            output={},
+            errors=[error_msg],
+            next_stage=None,
+            execution_time_ms=0.0
+        )
 
 
 class ValidationNode(PipelineNode):
@@ -181,26 +507,29 @@ class ValidationNode(PipelineNode):
     - Values are within expected ranges
     """
     
+    __slots__ = ("required_fields", "_required_set")
+    
     def __init__(self, required_fields: List[str]):
         super().__init__("Validator", PipelineStage.VALIDATION)
         self.required_fields = required_fields
+        self._required_set = frozenset(required_fields)
     
     def execute(self, context: Context) -> StageResult:
         """Validate raw data."""
-        print(f"✅ [{self.name}] Validating data...")
+        logger.debug("✅ [%s] Validating data...", self.name)
         
-        errors = []
-        validated = {}
+        raw_data = context.raw_data
         
-        # Check required fields
-        for field in self.required_fields:
-            if field not in context.raw_data:
-                errors.append(f"Missing required field: {field}")
-            else:
-                validated[field] = context.raw_data[field]
+        # Check required fields with one C-level set difference
+        missing = self._required_set - raw_data.keys()
         
-        if errors:
-            context.errors.extend(errors)
+        if missing:
+            # Report in declaration order so errors are reproducible
+            errors = [
+                f"Missing required field: {field}"
+                for field in self.required_fields
+                if field in missing
+            ]
             self._log_execution(context, False, errors)
             
             return StageResult(
@@ -211,6 +540,8 @@ class ValidationNode(PipelineNode):
                 execution_time_ms=50.0
             )
         
+        validated = {field: raw_data[field] for field in self.required_fields}
+        
         # Update context
         context.validated_data = validated
         context.current_stage = PipelineStage.ANALYSIS
@@ -224,6 +555,10 @@ class ValidationNode(PipelineNode):
             next_stage=PipelineStage.ANALYSIS,
             execution_time_ms=50.0
         )
+    
+    async def execute_async(self, context: Context) -> StageResult:
+        """Validation is pure CPU work; run it inline on the event loop."""
+        return self.execute(context)
 
 
 class AnalysisNode(PipelineNode):
@@ -237,44 +572,78 @@ class AnalysisNode(PipelineNode):
     - Anomaly detection
     """
     
-    def __init__(self, analysis_function: Callable[[Dict[str, Any]], Dict[str, Any]]):
+    __slots__ = ("analysis_function", "run_in_thread")
+    
+    def __init__(
+        self,
+        analysis_function: Callable[[Dict[str, Any]], Dict[str, Any]],
+        run_in_thread: bool = False,
+    ):
         super().__init__("Analyzer", PipelineStage.ANALYSIS)
         self.analysis_function = analysis_function
+        self.run_in_thread = run_in_thread
     
     def execute(self, context: Context) -> StageResult:
         """Analyze validated data."""
-        print(f"🔍 [{self.name}] Analyzing data...")
+        logger.debug("🔍 [%s] Analyzing data...", self.name)
         
         try:
             # Perform analysis
-            results = self.analysis_function(context.validated_data)
-            
-            # Update context
-            context.analysis_results = results
-            context.current_stage = PipelineStage.REPORT_GENERATION
-            
-            self._log_execution(context, True, [])
-            
-            return StageResult(
-                success=True,
-                output=results,
-                errors=[],
-                next_stage=PipelineStage.REPORT_GENERATION,
-                execution_time_ms=200.0
-            )
-            
+            results = _call_sync(self.analysis_function, context.validated_data)
         except Exception as e:
-            error_msg = f"Analysis failed: {str(e)}"
-            context.errors.append(error_msg)
-            self._log_execution(context, False, [error_msg])
-            
-            return StageResult(
-                success=False,
-                output={},
-                errors=[error_msg],
-                next_stage=None,
-                execution_time_ms=0.0
+            return self._fail(context, e)
+        
+        return self._complete(context, results)
+    
+    async def execute_async(self, context: Context) -> StageResult:
+        """
+        Analyze validated data without blocking the event loop.
+        
+        Async analyzers are awaited directly; sync analyzers run inline, or in
+        a worker thread when ``run_in_thread`` is set. Either way the context
+        is only updated on the loop thread.
+        """
+        logger.debug("🔍 [%s] Analyzing data...", self.name)
+        
+        try:
+            results = await _call_async(
+                self.analysis_function, context.validated_data, self.run_in_thread
             )
+        except Exception as e:
+            return self._fail(context, e)
+        
+        return self._complete(context, results)
+    
+    def _complete(self, context: Context, results: Dict[str, Any]) -> StageResult:
+        """Hand analysis results to the next stage."""
+        # Update context; parallel analyzers merge their results
+        if context.analysis_results:
+            results = {**context.analysis_results, **results}
+        context.analysis_results = results
+        context.current_stage = PipelineStage.REPORT_GENERATION
+        
+        self._log_execution(context, True, [])
+        
+        return StageResult(
+            success=True,
+            output=results,
+            errors=[],
+            next_stage=PipelineStage.REPORT_GENERATION,
+            execution_time_ms=200.0
+        )
+    
+    def _fail(self, context: Context, error: Exception) -> StageResult:
+        """Record an analysis failure."""
+        error_msg = f"Analysis failed: {str(error)}"
+        self._log_execution(context, False, [error_msg])
+        
+        return StageResult(
+            success=False,
+            output={},
+            errors=[error_msg],
+            next_stage=None,
+            execution_time_ms=0.0
+        )
 
 
 class ReportGenerationNode(PipelineNode):
@@ -287,13 +656,46 @@ class ReportGenerationNode(PipelineNode):
     - Insights and recommendations
     """
     
+    # Template fields and how to compute them; only fields the template
+    # actually references are computed.
+    _FIELDS: Dict[str, Callable[[Context], Any]] = {
+        "query": lambda ctx: ctx.query,
+        "validated_data": lambda ctx: ctx._json_cached("validated_data"),
+        "analysis_results": lambda ctx: ctx._json_cached("analysis_results"),
+        "insights": lambda ctx: "Based on the analysis, we found significant patterns...",
+        "recommendations": lambda ctx: "1. Action item one\n2. Action item two",
+        "timestamp": lambda ctx: datetime.utcnow().isoformat(),
+        "stage_count": lambda ctx: len(ctx.stage_history),
+    }
+    
+    _CONVERSIONS: Dict[str, Callable[[Any], str]] = {"s": str, "r": repr, "a": ascii}
+    
+    __slots__ = (
+        "report_template",
+        "_template_parts",
+        "_template_fields",
+        "_simple_template",
+    )
+    
     def __init__(self, report_template: Optional[str] = None):
         super().__init__("ReportGenerator", PipelineStage.REPORT_GENERATION)
         self.report_template = report_template or self._default_template()
+        
+        # Parse the template once instead of on every report
+        self._template_parts = list(string.Formatter().parse(self.report_template))
+        self._template_fields = frozenset(
+            name for _, name, _, _ in self._template_parts if name is not None
+        )
+        # Attribute/index lookups and nested specs are left to str.format
+        self._simple_template = all(
+            name.isidentifier() and "{" not in spec
+            for _, name, spec, _ in self._template_parts
+            if name is not None
+        )
     
     def execute(self, context: Context) -> StageResult:
         """Generate final report."""
-        print(f"📄 [{self.name}] Generating report...")
+        logger.debug("📄 [%s] Generating report...", self.name)
         
         try:
             # Generate report
@@ -315,7 +717,6 @@ class ReportGenerationNode(PipelineNode):
             
         except Exception as e:
             error_msg = f"Report generation failed: {str(e)}"
-            context.errors.append(error_msg)
             self._log_execution(context, False, [error_msg])
             
             return StageResult(
@@ -326,6 +727,10 @@ class ReportGenerationNode(PipelineNode):
                 execution_time_ms=0.0
             )
     
+    async def execute_async(self, context: Context) -> StageResult:
+        """Report rendering is pure CPU work; run it inline on the event loop."""
+        return self.execute(context)
+    
     def _default_template(self) -> str:
         """Default report template."""
         return """
@@ -350,15 +755,28 @@ Pipeline stages: {stage_count}
     
     def _generate_report(self, context: Context) -> str:
         """Generate formatted report."""
-        return self.report_template.format(
-            query=context.query,
-            validated_data=json.dumps(context.validated_data, indent=2),
-            analysis_results=json.dumps(context.analysis_results, indent=2),
-            insights="Based on the analysis, we found significant patterns...",
-            recommendations="1. Action item one\n2. Action item two",
-            timestamp=datetime.utcnow().isoformat(),
-            stage_count=len(context.stage_history)
-        )
+        values = {
+            name: build(context)
+            for name, build in self._FIELDS.items()
+            if name in self._template_fields
+        }
+        
+        if not self._simple_template:
+            return self.report_template.format(**values)
+        
+        # Write literals and the (cached) JSON sections straight into one
+        # buffer rather than building intermediate strings
+        buf = io.StringIO()
+        write = buf.write
+        for literal, name, spec, conversion in self._template_parts:
+            write(literal)
+            if name is None:
+                continue
+            value = values[name]
+            if conversion:
+                value = self._CONVERSIONS[conversion](value)
+            write(format(value, spec) if spec else str(value))
+        return buf.getvalue()
 
 
 class Pipeline:
@@ -370,15 +788,120 @@ class Pipeline:
     - Execute pipeline with context passing
     - Handle errors and recovery
     - Track execution history
+    
+    By default nodes run in the fixed stage order. Once edges are added
+    (`add_edge`, `add_fan_out`, `add_fan_in`) the pipeline runs as a DAG
+    and independent branches execute concurrently in `execute_async`.
     """
     
-    def __init__(self, name: str):
+    _DEFAULT_STAGE_ORDER: Tuple[PipelineStage, ...] = (
+        PipelineStage.DATA_COLLECTION,
+        PipelineStage.VALIDATION,
+        PipelineStage.ANALYSIS,
+        PipelineStage.REPORT_GENERATION,
+    )
+    
+    def __init__(
+        self,
+        name: str,
+        verbose: bool = False,
+        stage_order: Optional[Iterable[PipelineStage]] = None,
+        freeze_handoffs: bool = False
+    ):
         self.name = name
+        # Linear execution order; built once rather than on every run
+        self.stage_order: Tuple[PipelineStage, ...] = (
+            tuple(stage_order) if stage_order is not None
+            else Pipeline._DEFAULT_STAGE_ORDER
+        )
+        # Progress messages go to the module logger: INFO when verbose,
+        # DEBUG otherwise, so batch runs don't contend on stdout
+        self.verbose = verbose
+        self._log_level = logging.INFO if verbose else logging.DEBUG
+        self.freeze_handoffs = freeze_handoffs
         self.nodes: Dict[PipelineStage, PipelineNode] = {}
+        self.nodes_by_id: Dict[str, PipelineNode] = {}
+        self.graph: Dict[str, List[str]] = {}
+        self._topo_order: Optional[List[str]] = None
     
-    def add_node(self, node: PipelineNode):
-        """Add a node to the pipeline."""
+    def _handoff(self, context: Context):
+        """
+        Freeze collected data before it is handed to the next stage.
+        
+        With `freeze_handoffs`, raw_data is shallow-copied once and exposed
+        as a read-only MappingProxyType: later stages can't mutate it and
+        the data source's own dict is no longer aliased, without paying for
+        a defensive deepcopy at every stage.
+        """
+        if self.freeze_handoffs and type(context.raw_data) is dict:
+            context.raw_data = MappingProxyType(dict(context.raw_data))
+    
+    def _log(self, msg: str, *args: Any):
+        """Log a pipeline progress message at this pipeline's level."""
+        logger.log(self._log_level, msg, *args)
+    
+    def add_node(self, node: PipelineNode, node_id: Optional[str] = None):
+        """
+        Add a node to the pipeline.
+        
+        Args:
+            node: Node to register
+            node_id: Graph identifier; defaults to the node's stage value
+        """
+        node_id = node_id or node.stage.value
         self.nodes[node.stage] = node
+        self.nodes_by_id[node_id] = node
+        self.graph.setdefault(node_id, [])
+        self._topo_order = None
+    
+    def add_edge(self, src: str, dst: str):
+        """Run node `dst` only after node `src` has succeeded."""
+        for node_id in (src, dst):
+            if node_id not in self.nodes_by_id:
+                raise ValueError(f"Unknown node: {node_id}")
+        self.graph[src].append(dst)
+        self._topo_order = None
+    
+    def add_fan_out(self, src: str, dsts: List[str]):
+        """Feed one node's output to several independent nodes."""
+        for dst in dsts:
+            self.add_edge(src, dst)
+    
+    def add_fan_in(self, srcs: List[str], dst: str):
+        """Run one node after all of several nodes have succeeded."""
+        for src in srcs:
+            self.add_edge(src, dst)
+    
+    @property
+    def is_graph(self) -> bool:
+        """Whether explicit edges replace the default stage order."""
+        return any(self.graph.values())
+    
+    def _in_degrees(self) -> Dict[str, int]:
+        """Count incoming edges per node."""
+        in_degree = {node_id: 0 for node_id in self.graph}
+        for successors in self.graph.values():
+            for successor in successors:
+                in_degree[successor] += 1
+        return in_degree
+    
+    def _topological_order(self) -> List[str]:
+        """Return node ids in dependency order, rejecting cycles."""
+        if self._topo_order is None:
+            in_degree = self._in_degrees()
+            ready = [node_id for node_id, degree in in_degree.items() if degree == 0]
+            order = []
+            while ready:
+                node_id = ready.pop(0)
+                order.append(node_id)
+                for successor in self.graph[node_id]:
+                    in_degree[successor] -= 1
+                    if in_degree[successor] == 0:
+                        ready.append(successor)
+            if len(order) != len(self.graph):
+                raise ValueError(f"Pipeline graph has a cycle: {self.name}")
+            self._topo_order = order
+        return self._topo_order
     
     def execute(self, query: str) -> Context:
         """
@@ -387,42 +910,201 @@ class Pipeline:
         Returns:
             Final context with all stage outputs
         """
-        print(f"\n🚀 Starting pipeline: {self.name}")
-        print(f"📋 Query: {query}")
-        print("=" * 60)
+        log = self._log
+        log("🚀 Starting pipeline: %s", self.name)
+        log("📋 Query: %s", query)
         
         # Initialize context
         context = Context(query=query)
         
-        # Execute stages in order
-        stage_order = [
-            PipelineStage.DATA_COLLECTION,
-            PipelineStage.VALIDATION,
-            PipelineStage.ANALYSIS,
-            PipelineStage.REPORT_GENERATION
-        ]
+        if self.is_graph:
+            # Walk the DAG one node at a time in dependency order
+            for node_id in self._topological_order():
+                if not self._run_stage(context, node_id, self.nodes_by_id[node_id]):
+                    break
+        else:
+            # Execute stages in order
+            for stage in self.stage_order:
+                if stage not in self.nodes:
+                    log("⚠️  No node registered for stage: %s", stage.value)
+                    continue
+                
+                if not self._run_stage(context, stage.value, self.nodes[stage]):
+                    break
         
-        for stage in stage_order:
-            if stage not in self.nodes:
-                print(f"⚠️  No node registered for stage: {stage.value}")
+        log(
+            "📊 Pipeline complete! Final stage: %s, errors: %d",
+            context.current_stage.value,
+            len(context.errors)
+        )
+        
+        return context
+    
+    def _run_stage(self, context: Context, label: str, node: PipelineNode) -> bool:
+        """Execute one node synchronously and report whether it succeeded."""
+        result = node.execute(context)
+        self._handoff(context)
+        
+        if not result.success:
+            self._log("❌ Pipeline failed at stage: %s (errors: %s)", label, result.errors)
+            return False
+        
+        self._log("✅ Stage complete: %s", label)
+        return True
+    
+    async def execute_async(self, query: str) -> Context:
+        """
+        Execute the full pipeline, awaiting each stage.
+        
+        In the default linear mode stages run in order; the gain comes from
+        running many queries concurrently (see `execute_many`). In graph mode
+        every node whose dependencies have succeeded runs concurrently.
+        
+        Returns:
+            Final context with all stage outputs
+        """
+        context = Context.acquire(query)
+        
+        if self.is_graph:
+            await self._execute_graph(context)
+            return context
+        
+        for stage in self.stage_order:
+            node = self.nodes.get(stage)
+            if node is None:
                 continue
             
-            node = self.nodes[stage]
-            result = node.execute(context)
+            result = await node.execute_async(context)
+            self._handoff(context)
             
             if not result.success:
-                print(f"❌ Pipeline failed at stage: {stage.value}")
-                print(f"   Errors: {result.errors}")
                 break
+        
+        return context
+    
+    async def _execute_graph(self, context: Context):
+        """
+        Run the DAG, starting each node as soon as its inputs are ready.
+        
+        Built-in nodes update the context on the loop thread between awaits.
+        Custom nodes using the default `execute_async` run `execute` in a
+        worker thread, so parallel branches may record concurrently;
+        `Context._record` and revision bumps take a module-level lock, and
+        each stage output is a single attribute rebind. After a failure no
+        new nodes start; in-flight nodes are allowed to finish so their
+        history entries are kept.
+        """
+        self._topological_order()  # Reject cycles before starting any work
+        
+        in_degree = self._in_degrees()
+        ready = [node_id for node_id, degree in in_degree.items() if degree == 0]
+        running: Dict[asyncio.Task, str] = {}
+        failed = False
+        
+        while ready or running:
+            if not failed:
+                for node_id in ready:
+                    task = asyncio.create_task(
+                        self.nodes_by_id[node_id].execute_async(context)
+                    )
+                    running[task] = node_id
+            ready = []
             
-            print(f"✅ Stage complete: {stage.value}")
+            if not running:
+                break
+            
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            
+            for task in done:
+                node_id = running.pop(task)
+                self._handoff(context)
+                if not task.result().success:
+                    failed = True
+                    continue
+                
+                for successor in self.graph[node_id]:
+                    in_degree[successor] -= 1
+                    if in_degree[successor] == 0:
+                        ready.append(successor)
+    
+    async def execute_many(
+        self,
+        queries: Iterable[str],
+        concurrency: int = 8,
+        collect: Optional[Callable[[Context], Any]] = None
+    ) -> List[Any]:
+        """
+        Execute the pipeline for many queries concurrently.
         
-        print("=" * 60)
-        print(f"📊 Pipeline complete!")
-        print(f"   Final stage: {context.current_stage.value}")
-        print(f"   Errors: {len(context.errors)}")
+        At most `concurrency` pipelines are in flight at once, so I/O-bound
+        stages (DB, API, LLM calls) overlap instead of serializing.
         
-        return context
+        Args:
+            queries: Queries to run
+            concurrency: Maximum number of pipelines in flight
+            collect: Optional reducer applied to each final context. When
+                given, only its return value is kept and the context is
+                released back to the pool for reuse by later queries.
+        
+        Returns:
+            One final context (or collected value) per query, in input order
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _run(query: str) -> Any:
+            async with semaphore:
+                context = await self.execute_async(query)
+                if collect is None:
+                    return context
+                value = collect(context)
+                Context.release(context)
+                return value
+        
+        return await asyncio.gather(*[_run(query) for query in queries])
+    
+    async def execute_stream(
+        self,
+        queries: Iterable[str],
+        concurrency: int = 8
+    ) -> AsyncIterator[Context]:
+        """
+        Execute the pipeline for many queries, yielding contexts as they finish.
+        
+        A sliding window keeps at most `concurrency` pipelines in flight and
+        pulls the next query only when one completes, so memory stays bounded
+        by the window rather than the batch size. Results arrive in
+        completion order, not input order.
+        
+        Usage:
+            async for context in pipeline.execute_stream(queries, concurrency=16):
+                store(context)
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        
+        pending = iter(queries)
+        active: Set[asyncio.Task] = {
+            asyncio.create_task(self.execute_async(query))
+            for query in itertools.islice(pending, concurrency)
+        }
+        
+        try:
+            while active:
+                done, active = await asyncio.wait(
+                    active, return_when=asyncio.FIRST_COMPLETED
+                )
+                # Refill the window before handing results to the consumer
+                for query in itertools.islice(pending, len(done)):
+                    active.add(asyncio.create_task(self.execute_async(query)))
+                for task in done:
+                    yield task.result()
+        finally:
+            # Consumer stopped early: don't leave orphaned pipelines running
+            for task in active:
+                task.cancel()
 
 
 # Example data source and analysis functions
@@ -437,23 +1119,53 @@ def mock_data_source(query: str) -> Dict[str, Any]:
         ],
         "metadata": {
             "source": "mock_api",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _ns_to_iso(time.time_ns())
         }
     }
 
 
+# Below this many points the builtin reductions beat building an array
+_NUMPY_MIN_POINTS = 10_000
+
+
+def _summarize(data_points: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Count/mean/max/min of the `value` of each data point.
+    
+    Large series are loaded into a float64 array once and reduced with
+    NumPy's vectorized kernels; this is the recommended pattern for custom
+    analyzers too. Small series (or no NumPy) use the builtins.
+    """
+    count = len(data_points)
+    if not count:
+        return {"count": 0, "mean": 0, "max": 0, "min": 0}
+    
+    if np is not None and count >= _NUMPY_MIN_POINTS:
+        values = np.fromiter(
+            (dp["value"] for dp in data_points), dtype=np.float64, count=count
+        )
+        # Index back into the input so max/min keep the values' own type
+        # (and the first extreme), exactly as the builtins return them
+        return {
+            "count": count,
+            "mean": float(values.mean()),
+            "max": data_points[int(values.argmax())]["value"],
+            "min": data_points[int(values.argmin())]["value"],
+        }
+    
+    values = [dp["value"] for dp in data_points]
+    return {
+        "count": count,
+        "mean": sum(values) / count,
+        "max": max(values),
+        "min": min(values),
+    }
+
+
 def mock_analysis(data: Dict[str, Any]) -> Dict[str, Any]:
     """Mock analysis function for demonstration."""
-    data_points = data.get("data_points", [])
-    values = [dp["value"] for dp in data_points]
-    
     return {
-        "statistics": {
-            "count": len(values),
-            "mean": sum(values) / len(values) if values else 0,
-            "max": max(values) if values else 0,
-            "min": min(values) if values else 0,
-        },
+        "statistics": _summarize(data.get("data_points", [])),
         "trends": [
             {"type": "increasing", "confidence": 0.7}
         ],
@@ -468,7 +1180,7 @@ def demo():
     print("=" * 60)
     
     # Create pipeline
-    pipeline = Pipeline("Data Analysis Pipeline")
+    pipeline = Pipeline("Data Analysis Pipeline", verbose=True)
     
     # Add nodes
     pipeline.add_node(DataCollectionNode(mock_data_source))
@@ -486,10 +1198,10 @@ def demo():
     print(f"\nQuery: {context.query}")
     print(f"\nRaw Data Keys: {list(context.raw_data.keys())}")
     print(f"\nValidated Data: {context.validated_data}")
-    print(f"\nAnalysis Results: {json.dumps(context.analysis_results, indent=2)}")
+    print(f"\nAnalysis Results: {_dumps(context.analysis_results)}")
     print(f"\nStage History:")
     for entry in context.stage_history:
-        print(f"  - {entry['stage']}: {entry['node']} ({'✅' if entry['success'] else '❌'})")
+        print(f"  - {entry.stage}: {entry.node} ({'✅' if entry.success else '❌'})")
     
     if context.final_report:
         print("\n" + "=" * 60)
@@ -501,4 +1213,5 @@ def demo():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
     demo()
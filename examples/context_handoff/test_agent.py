@@ -2,7 +2,11 @@
 Unit tests for Context Handoff example.
 """
 
+import asyncio
+import copy
+import pickle
 import unittest
+from dataclasses import asdict
 from unittest.mock import Mock, MagicMock
 from datetime import datetime
 
@@ -15,6 +19,7 @@ from agent import (
     ValidationNode,
     AnalysisNode,
     ReportGenerationNode,
+    StageRecord,
     StageResult,
     mock_data_source,
     mock_analysis
@@ -52,6 +57,59 @@ class TestContext(unittest.TestCase):
         
         self.assertEqual(restored.query, "test")
         self.assertEqual(restored.raw_data, {"data": [1, 2, 3]})
+    
+    def test_context_is_plain_data(self):
+        """Test contexts work with asdict, deepcopy and pickle."""
+        ctx = Context(query="test")
+        ValidationNode(required_fields=[]).execute(ctx)
+        
+        self.assertEqual(asdict(ctx)["query"], "test")
+        self.assertEqual(copy.deepcopy(ctx).stage_history, ctx.stage_history)
+        restored = pickle.loads(pickle.dumps(ctx))
+        self.assertEqual(restored.stage_history, ctx.stage_history)
+        
+        # The copy still tracks reassignments
+        restored.raw_data = {"key": "value"}
+        self.assertEqual(restored.to_dict()["raw_data"], {"key": "value"})
+    
+    def test_serialization_cache_invalidation(self):
+        """Test cached JSON and dict forms refresh when fields are reassigned."""
+        ctx = Context(query="test")
+        ctx.analysis_results = {"mean": 1}
+        
+        first = ctx._json_cached("analysis_results")
+        self.assertIs(ctx._json_cached("analysis_results"), first)
+        
+        ctx.analysis_results = {"mean": 2}
+        self.assertIn('"mean": 2', ctx._json_cached("analysis_results"))
+        
+        ctx.stage_history.append(StageRecord("analysis", "Analyzer", True, [], 0))
+        self.assertEqual(len(ctx.to_dict()["stage_history"]), 1)
+    
+    def test_timestamps_formatted_on_serialization(self):
+        """Test nanosecond timestamps become ISO strings only in to_dict."""
+        ctx = Context(query="test")
+        ValidationNode(required_fields=[]).execute(ctx)
+        
+        self.assertIsInstance(ctx.stage_history[0].ts_ns, int)
+        
+        data = ctx.to_dict()
+        self.assertIn("timestamp", data["stage_history"][0])
+        self.assertNotIn("ts_ns", data["stage_history"][0])
+        # Naive UTC, like datetime.utcnow().isoformat()
+        self.assertIsNone(datetime.fromisoformat(data["start_time"]).tzinfo)
+        self.assertIn("timestamp", mock_data_source("q")["metadata"])
+        
+        restored = Context.from_dict(data)
+        self.assertEqual(restored.start_time_ns // 1000, ctx.start_time_ns // 1000)
+        self.assertEqual(
+            Context.from_dict({**data, "start_time": "1970-01-01T01:00:00+01:00"}).start_time_ns,
+            0
+        )
+        self.assertEqual(
+            restored.stage_history[0].ts_ns // 1000,
+            ctx.stage_history[0].ts_ns // 1000
+        )
 
 
 class TestDataCollectionNode(unittest.TestCase):
@@ -141,6 +199,16 @@ class TestAnalysisNode(unittest.TestCase):
         
         self.assertFalse(result.success)
         self.assertIn("Analysis error", result.errors[0])
+    
+    def test_statistics_types_do_not_depend_on_size(self):
+        """Test small and large series report max/min with the input's types."""
+        for n in (7, 20_000):
+            points = [{"value": i % 7} for i in range(n)]
+            stats = mock_analysis({"data_points": points})["statistics"]
+            self.assertEqual((stats["max"], stats["min"]), (6, 0))
+            self.assertIs(type(stats["max"]), int)
+            self.assertIs(type(stats["min"]), int)
+            self.assertIsInstance(stats["mean"], float)
 
 
 class TestReportGenerationNode(unittest.TestCase):
@@ -160,6 +228,27 @@ class TestReportGenerationNode(unittest.TestCase):
         self.assertIsNotNone(ctx.final_report)
         self.assertIn("test", ctx.final_report)
         self.assertEqual(result.next_stage, PipelineStage.COMPLETE)
+    
+    def test_custom_template_matches_str_format(self):
+        """Test the pre-parsed template renders like str.format."""
+        template = "{{literal}} {query!r} has {stage_count:03d} stages"
+        node = ReportGenerationNode(report_template=template)
+        
+        ctx = Context(query="test")
+        ctx.stage_history.append(StageRecord("analysis", "Analyzer", True, [], 0))
+        
+        self.assertEqual(
+            node._generate_report(ctx),
+            template.format(query="test", stage_count=1)
+        )
+    
+    def test_unknown_template_field_fails_stage(self):
+        """Test that an unknown template field is reported as a stage failure."""
+        node = ReportGenerationNode(report_template="{missing}")
+        
+        result = node.execute(Context(query="test"))
+        
+        self.assertFalse(result.success)
 
 
 class TestPipeline(unittest.TestCase):
@@ -196,6 +285,53 @@ class TestPipeline(unittest.TestCase):
         self.assertIsNotNone(ctx.final_report)
         self.assertEqual(ctx.current_stage, PipelineStage.COMPLETE)
     
+    def test_custom_stage_order(self):
+        """Test that a custom stage order limits and orders execution."""
+        pipeline = Pipeline(
+            "Custom",
+            stage_order=[PipelineStage.DATA_COLLECTION, PipelineStage.VALIDATION]
+        )
+        pipeline.add_node(DataCollectionNode(mock_data_source))
+        pipeline.add_node(ValidationNode(required_fields=["query"]))
+        pipeline.add_node(AnalysisNode(mock_analysis))
+        
+        ctx = pipeline.execute("test")
+        
+        self.assertEqual(ctx.analysis_results, {})
+        self.assertEqual(len(ctx.stage_history), 2)
+    
+    def test_freeze_handoffs(self):
+        """Test frozen handoffs are read-only and detached from the source dict."""
+        source_data = {"query": "test", "data_points": [{"value": 1}]}
+        pipeline = Pipeline("Frozen", freeze_handoffs=True)
+        pipeline.add_node(DataCollectionNode(lambda query: source_data))
+        pipeline.add_node(ValidationNode(required_fields=["query", "data_points"]))
+        pipeline.add_node(AnalysisNode(mock_analysis))
+        pipeline.add_node(ReportGenerationNode())
+        
+        ctx = pipeline.execute("test")
+        source_data["query"] = "mutated by caller"
+        
+        self.assertEqual(ctx.current_stage, PipelineStage.COMPLETE)
+        self.assertEqual(ctx.raw_data["query"], "test")
+        with self.assertRaises(TypeError):
+            ctx.raw_data["query"] = "mutated downstream"
+        self.assertEqual(Context.from_json(ctx.to_json()).raw_data["query"], "test")
+    
+    def test_verbose_logging_level(self):
+        """Test progress is logged at INFO only for verbose pipelines."""
+        quiet = Pipeline("Quiet")
+        quiet.add_node(ValidationNode(required_fields=[]))
+        loud = Pipeline("Loud", verbose=True)
+        loud.add_node(ValidationNode(required_fields=[]))
+        
+        with self.assertLogs("agent", level="INFO") as logs:
+            loud.execute("test")
+            quiet.execute("test")
+        
+        self.assertFalse(any("Quiet" in line for line in logs.output))
+        self.assertTrue(any("Starting pipeline: Loud" in line for line in logs.output))
+    
     def test_pipeline_error_handling(self):
         """Test pipeline stops on error."""
         pipeline = Pipeline("Test Pipeline")
@@ -211,6 +347,203 @@ class TestPipeline(unittest.TestCase):
         self.assertGreater(len(ctx.errors), 0)
 
 
+class TestAsyncPipeline(unittest.TestCase):
+    """Test async and batched pipeline execution."""
+    
+    def _build_pipeline(self, data_source=mock_data_source, analysis=mock_analysis):
+        pipeline = Pipeline("Async Pipeline")
+        pipeline.add_node(DataCollectionNode(data_source))
+        pipeline.add_node(ValidationNode(required_fields=["query", "data_points"]))
+        pipeline.add_node(AnalysisNode(analysis))
+        pipeline.add_node(ReportGenerationNode())
+        return pipeline
+    
+    def test_execute_async_with_coroutine_nodes(self):
+        """Test that async data sources and analyzers are awaited."""
+        async def async_source(query):
+            await asyncio.sleep(0)
+            return mock_data_source(query)
+        
+        async def async_analysis(data):
+            await asyncio.sleep(0)
+            return mock_analysis(data)
+        
+        pipeline = self._build_pipeline(async_source, async_analysis)
+        ctx = asyncio.run(pipeline.execute_async("async query"))
+        
+        self.assertEqual(ctx.current_stage, PipelineStage.COMPLETE)
+        self.assertEqual(ctx.analysis_results["statistics"]["count"], 3)
+    
+    def test_run_in_thread_offloads_sync_callables(self):
+        """Test sync callables run inline by default and offload on request."""
+        import threading
+        seen = []
+        
+        def recording_source(query):
+            seen.append(threading.current_thread())
+            return mock_data_source(query)
+        
+        pipeline = self._build_pipeline(recording_source)
+        asyncio.run(pipeline.execute_async("inline"))
+        
+        threaded = Pipeline("Threaded Pipeline")
+        threaded.add_node(DataCollectionNode(recording_source, run_in_thread=True))
+        asyncio.run(threaded.execute_async("threaded"))
+        
+        self.assertIs(seen[0], threading.main_thread())
+        self.assertIsNot(seen[1], threading.main_thread())
+    
+    def test_sync_execute_rejects_async_source(self):
+        """Test the sync path fails the stage instead of storing a coroutine."""
+        async def async_source(query):
+            return mock_data_source(query)
+        
+        ctx = self._build_pipeline(async_source).execute("query")
+        
+        self.assertEqual(ctx.raw_data, {})
+        self.assertTrue(any("execute_async" in err for err in ctx.errors))
+    
+    def test_execute_many_respects_concurrency(self):
+        """Test batched execution keeps order and caps in-flight pipelines."""
+        in_flight = 0
+        peak = 0
+        
+        async def slow_source(query):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return mock_data_source(query)
+        
+        pipeline = self._build_pipeline(slow_source)
+        queries = [f"query {i}" for i in range(10)]
+        contexts = asyncio.run(pipeline.execute_many(queries, concurrency=3))
+        
+        self.assertEqual([ctx.query for ctx in contexts], queries)
+        self.assertTrue(all(ctx.final_report for ctx in contexts))
+        self.assertLessEqual(peak, 3)
+        self.assertGreater(peak, 1)
+        
+        with self.assertRaises(ValueError):
+            asyncio.run(pipeline.execute_many(queries, concurrency=0))
+    
+    def test_execute_many_collect_recycles_contexts(self):
+        """Test collected batches return reduced values and reuse contexts."""
+        pipeline = self._build_pipeline()
+        queries = [f"query {i}" for i in range(6)]
+        
+        reports = asyncio.run(pipeline.execute_many(
+            queries, concurrency=2, collect=lambda ctx: ctx.final_report
+        ))
+        
+        self.assertEqual(len(reports), len(queries))
+        for query, report in zip(queries, reports):
+            self.assertIn(query, report)
+        
+        # A recycled context comes back clean
+        ctx = Context.acquire("fresh")
+        self.assertEqual(ctx.query, "fresh")
+        self.assertEqual(ctx.stage_history, [])
+        self.assertEqual(ctx.raw_data, {})
+        self.assertIsNone(ctx.final_report)
+        self.assertEqual(ctx.current_stage, PipelineStage.DATA_COLLECTION)
+    
+    def test_execute_many_collect_keeps_results_separate(self):
+        """Test values collected from pooled contexts are not overwritten on reuse."""
+        def failing_source(query):
+            raise RuntimeError(f"boom {query}")
+        
+        pipeline = Pipeline("Failing Pipeline")
+        pipeline.add_node(DataCollectionNode(failing_source))
+        
+        results = asyncio.run(pipeline.execute_many(
+            ["a", "b", "c"], concurrency=1, collect=Context.to_dict
+        ))
+        
+        for query, result in zip("abc", results):
+            self.assertEqual(len(result["errors"]), 1)
+            self.assertIn(f"boom {query}", result["errors"][0])
+    
+    def test_execute_stream_bounded_window(self):
+        """Test streaming execution yields every query with a bounded window."""
+        in_flight = 0
+        peak = 0
+        
+        async def slow_source(query):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001 * (len(query) % 3))
+            in_flight -= 1
+            return mock_data_source(query)
+        
+        pipeline = self._build_pipeline(slow_source)
+        queries = [f"query {i}" for i in range(20)]
+        
+        async def collect():
+            return [ctx async for ctx in pipeline.execute_stream(queries, concurrency=4)]
+        
+        contexts = asyncio.run(collect())
+        
+        self.assertEqual(sorted(ctx.query for ctx in contexts), sorted(queries))
+        self.assertLessEqual(peak, 4)
+    
+    def test_graph_fan_out_and_fan_in(self):
+        """Test independent sources run concurrently and merge before validation."""
+        started = []
+        
+        def make_source(key):
+            async def source(query):
+                started.append(key)
+                await asyncio.sleep(0.01)
+                return {key: query}
+            return source
+        
+        pipeline = Pipeline("Graph Pipeline")
+        pipeline.add_node(DataCollectionNode(make_source("sales")), node_id="sales")
+        pipeline.add_node(DataCollectionNode(make_source("inventory")), node_id="inventory")
+        pipeline.add_node(ValidationNode(required_fields=["sales", "inventory"]))
+        pipeline.add_fan_in(["sales", "inventory"], "validation")
+        
+        ctx = asyncio.run(pipeline.execute_async("q"))
+        
+        self.assertEqual(sorted(started), ["inventory", "sales"])
+        self.assertEqual(ctx.validated_data, {"sales": "q", "inventory": "q"})
+        self.assertEqual(ctx.current_stage, PipelineStage.ANALYSIS)
+    
+    def test_graph_threaded_nodes_record_safely(self):
+        """Test that custom nodes on parallel branches record every entry from their threads."""
+        class CountingNode(PipelineNode):
+            def execute(self, context):
+                for _ in range(2000):
+                    self._log_execution(context, True, ["e"])
+                return StageResult(True, {}, [], None, 0.0)
+        
+        pipeline = Pipeline("Threaded Graph")
+        for i in range(4):
+            pipeline.add_node(
+                CountingNode(f"n{i}", PipelineStage.ANALYSIS), node_id=f"n{i}"
+            )
+        pipeline.add_fan_out("n0", ["n1", "n2", "n3"])
+        
+        ctx = asyncio.run(pipeline.execute_async("q"))
+        
+        self.assertEqual(len(ctx.stage_history), 8000)
+        self.assertEqual(len(ctx.errors), 8000)
+    
+    def test_graph_rejects_cycles(self):
+        """Test that cyclic graphs are rejected before execution."""
+        pipeline = Pipeline("Cyclic")
+        pipeline.add_node(DataCollectionNode(mock_data_source), node_id="a")
+        pipeline.add_node(ValidationNode(required_fields=[]), node_id="b")
+        pipeline.add_edge("a", "b")
+        pipeline.add_edge("b", "a")
+        
+        with self.assertRaises(ValueError):
+            asyncio.run(pipeline.execute_async("q"))
+
+
 class TestIntegration(unittest.TestCase):
     """Integration tests."""
     
@@ -234,6 +567,22 @@ class TestIntegration(unittest.TestCase):
         self.assertEqual(restored.validated_data, {"clean": "data"})
         self.assertEqual(restored.analysis_results, {"result": 42})
     
+    def test_context_json_roundtrip(self):
+        """Test compact JSON checkpointing of a completed context."""
+        pipeline = Pipeline("Checkpoint Test")
+        pipeline.add_node(DataCollectionNode(mock_data_source))
+        pipeline.add_node(ValidationNode(required_fields=["query", "data_points"]))
+        pipeline.add_node(AnalysisNode(mock_analysis))
+        
+        ctx = pipeline.execute("checkpoint")
+        payload = ctx.to_json()
+        restored = Context.from_json(payload)
+        
+        self.assertIsInstance(payload, bytes)
+        self.assertEqual(restored.analysis_results, ctx.analysis_results)
+        self.assertEqual(restored.current_stage, ctx.current_stage)
+        self.assertEqual(len(restored.stage_history), len(ctx.stage_history))
+    
     def test_stage_history_tracking(self):
         """Test that stage execution is tracked."""
         pipeline = Pipeline("History Test")
@@ -245,8 +594,8 @@ class TestIntegration(unittest.TestCase):
         # Should have history entries
         self.assertGreaterEqual(len(ctx.stage_history), 1)
         
-        # Check history structure
-        for entry in ctx.stage_history:
+        # Check serialized history structure
+        for entry in ctx.to_dict()["stage_history"]:
             self.assertIn("stage", entry)
             self.assertIn("node", entry)
             self.assertIn("success", entry)
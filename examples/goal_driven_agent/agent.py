@@ -11,11 +11,381 @@ This pattern is useful when the agent needs to optimize for multiple
 objectives while respecting boundaries.
 """
 
+from collections import ChainMap, OrderedDict
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Mapping, Tuple
 from enum import Enum
-from datetime import datetime
+from datetime import datetime, timedelta
+from types import MappingProxyType
 import json
+import logging
+import math
+import numbers
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; goals fall back to builtin loops
+    np = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; scoring kernels run as plain Python
+    njit = None
+    prange = range
+
+try:
+    import orjson
+    
+    def _encode(obj: Any) -> bytes:
+        """Serialize to compact JSON bytes with orjson (C-accelerated)."""
+        return orjson.dumps(obj)
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    def _encode(obj: Any) -> bytes:
+        """Serialize to compact JSON bytes with the stdlib encoder."""
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+
+logger = logging.getLogger(__name__)
+
+# Below this many criteria/constraints plain lists beat numpy arrays
+_NUMPY_MIN_CRITERIA = 64
+
+# Below this many (action, row) cells the pure-Python kernel beats numpy
+# broadcasting when numba is unavailable
+_NUMPY_MIN_BATCH = 256
+
+# From this many actions on, select_action ranks actions by an upper bound
+# on their score and stops once no remaining bound can beat the best score
+_BOUND_MIN_ACTIONS = 32
+_BOUND_FIRST_CHUNK = 8
+
+# (action, goal) impact columns kept for reuse; least recently used go first
+_IMPACT_CACHE_SIZE = 1024
+
+_NAN = float("nan")
+
+_EPOCH = datetime(1970, 1, 1)
+
+# dataclass(slots=True) needs Python 3.10+; older versions keep __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _ns_to_iso(ts_ns: int) -> str:
+    """Format an epoch-nanosecond timestamp as a naive UTC ISO-8601 string."""
+    return (_EPOCH + timedelta(microseconds=ts_ns // 1000)).isoformat()
+
+
+def _as_float(value: Any) -> Optional[float]:
+    """Float form of a measurement: NaN for None, None if not numeric."""
+    if value is None:
+        return _NAN
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _buffer(values: List[Any]):
+    """Store a Goal column as a numpy array when large enough to pay off."""
+    if np is not None and len(values) >= _NUMPY_MIN_CRITERIA:
+        return np.array(values)
+    return list(values)
+
+
+def _jit(func):
+    """Compile a numeric kernel with numba when available."""
+    return njit(func) if njit is not None else func
+
+
+def _kernel_array(values, dtype=float):
+    """Hand a column to the scoring kernel: numpy arrays for numba, else lists."""
+    if njit is not None:
+        return np.asarray(values, dtype=dtype)
+    if np is not None and isinstance(values, np.ndarray):
+        return values.tolist()
+    return values
+
+
+def _criterion_met(current: float, target: float, tolerance: float) -> bool:
+    """Numeric `SuccessCriterion.is_satisfied`; NaN means no measurement."""
+    return abs(current - target) <= target * tolerance
+
+
+@_jit
+def _criterion_score(current: float, target: float, tolerance: float) -> float:
+    """Numeric `SuccessCriterion.satisfaction_score`; NaN means no measurement."""
+    if current != current:
+        return 0.0
+    if abs(current - target) <= target * tolerance:
+        return 1.0
+    if target == 0.0 or current == 0.0:
+        return 0.0
+    ratio = min(current / target, target / current)
+    return ratio if ratio > 0.0 else 0.0
+
+
+@_jit
+def _score_goal(score, current_progress, total_weight, target, weight, tol, fallback,
+                anchor, delta, impacted, c_limit, c_fallback, c_anchor, c_delta,
+                c_impacted, c_in_state, hard):
+    """
+    Add one goal's contribution to an action score.
+    
+    Numeric kernel behind `GoalDrivenAgent._evaluate_action`: a row's
+    predicted value is ``anchor + delta`` when the action impacts it and
+    ``fallback`` (its state value, or current value) otherwise.
+    `current_progress` and `total_weight` are the goal's baseline and
+    weight sum, shared by every action.
+    """
+    n = len(target)
+    if n:
+        predicted_score = 0.0
+        for i in range(n):
+            predicted = anchor[i] + delta[i] if impacted[i] else fallback[i]
+            predicted_score += _criterion_score(predicted, target[i], tol[i]) * weight[i]
+        if total_weight > 0.0:
+            improvement = predicted_score / total_weight - current_progress
+            score += improvement * total_weight
+    
+    for k in range(len(c_limit)):
+        if not (c_impacted[k] or c_in_state[k]):
+            continue
+        predicted = c_anchor[k] + c_delta[k] if c_impacted[k] else c_fallback[k]
+        if predicted > c_limit[k]:
+            if c_limit[k] == 0.0:
+                severity = 1.0
+            else:
+                severity = (predicted - c_limit[k]) / c_limit[k]
+            score -= severity * (1000.0 if hard[k] else 10.0)
+    
+    return score
+
+
+def _score_goal_rows(scores, current_progress, total_weight, target, weight, tol,
+                     fallback, anchor, deltas, impacted, c_limit, c_fallback, c_anchor,
+                     c_deltas, c_impacted, c_in_state, hard):
+    """Apply `_score_goal` to one row of impact columns per action, in place."""
+    for a in prange(len(scores)):
+        scores[a] = _score_goal(
+            scores[a], current_progress, total_weight, target, weight, tol,
+            fallback, anchor, deltas[a], impacted[a], c_limit, c_fallback,
+            c_anchor, c_deltas[a], c_impacted[a], c_in_state, hard
+        )
+
+
+# Actions are independent, so numba spreads the rows across cores
+if njit is not None:
+    _score_goal_rows = njit(parallel=True)(_score_goal_rows)
+
+
+def _score_goal_rows_np(scores, current_progress, total_weight, target, weight, tol,
+                        fallback, anchor, deltas, impacted, c_limit, c_fallback,
+                        c_anchor, c_deltas, c_impacted, c_in_state, hard):
+    """
+    Broadcast `_score_goal` over an (actions x rows) impact matrix, in place.
+    
+    Used instead of the Python loop when numpy is installed without numba.
+    """
+    target, weight, tol = np.asarray(target), np.asarray(weight), np.asarray(tol)
+    if len(target) and total_weight > 0.0:
+        predicted = np.where(
+            np.asarray(impacted),
+            np.asarray(anchor) + np.asarray(deltas),
+            np.asarray(fallback)
+        )
+        predicted_score = _criterion_scores_np(predicted, target, tol) @ weight
+        scores += (predicted_score / total_weight - current_progress) * total_weight
+    
+    c_limit = np.asarray(c_limit, dtype=float)
+    if len(c_limit):
+        c_impacted = np.asarray(c_impacted)
+        predicted = np.where(
+            c_impacted,
+            np.asarray(c_anchor) + np.asarray(c_deltas),
+            np.asarray(c_fallback)
+        )
+        violated = (c_impacted | np.asarray(c_in_state)) & (predicted > c_limit)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            severity = np.where(c_limit == 0.0, 1.0, (predicted - c_limit) / c_limit)
+        penalty = np.where(np.asarray(hard, dtype=bool), 1000.0, 10.0)
+        scores -= np.where(violated, severity * penalty, 0.0).sum(axis=1)
+
+
+def _stack_rows(rows: List[Any]):
+    """Stack per-action impact columns into a matrix for the batch kernel."""
+    return np.stack(rows) if njit is not None else rows
+
+
+def _impact_columns(impact: Dict[str, Any], names: List[str]):
+    """Deltas and impacted mask of an action over a goal's rows, or None if non-numeric."""
+    delta, impacted = [], []
+    for name in names:
+        if name in impact:
+            value = _as_float(impact[name])
+            if value is None:
+                return None
+            delta.append(value)
+            impacted.append(True)
+        else:
+            delta.append(0.0)
+            impacted.append(False)
+    return _kernel_array(delta), _kernel_array(impacted, bool)
+
+
+# How a state slot reads: never measured, numeric, measured as None, or
+# non-numeric (which sends the goal to the object path)
+_ABSENT, _NUMERIC, _NONE, _OTHER = 0, 1, 2, 3
+
+
+def _state_kind(value: Any, as_float: Optional[float]) -> int:
+    """Slot kind of a measurement given its `_as_float` form."""
+    if value is None:
+        return _NONE
+    return _OTHER if as_float is None else _NUMERIC
+
+
+def _state_columns(vec, kinds, slots, currents):
+    """
+    Fallback and anchor values of a goal's rows from the state vector, or
+    None if non-numeric.
+    
+    `slots` are the rows' state slots; rows never measured fall back to
+    their own current value.
+    """
+    if np is not None and isinstance(slots, np.ndarray):
+        kind = kinds[slots]
+        if (kind == _OTHER).any():
+            return None
+        value = vec[slots]
+        absent = kind == _ABSENT
+        return (
+            _kernel_array(np.where(absent, currents, value)),
+            # predict_changes replaces a None measurement with the delta
+            _kernel_array(np.where(kind == _NUMERIC, value, 0.0)),
+            _kernel_array(~absent, bool),
+        )
+    
+    fallback, anchor, in_state = [], [], []
+    for slot, current in zip(slots, currents):
+        kind = kinds[slot]
+        if kind == _NUMERIC:
+            value = vec[slot]
+            fallback.append(value)
+            anchor.append(value)
+            in_state.append(True)
+        elif kind == _ABSENT:
+            fallback.append(current)
+            anchor.append(0.0)
+            in_state.append(False)
+        elif kind == _NONE:
+            fallback.append(_NAN)
+            anchor.append(0.0)
+            in_state.append(True)
+        else:
+            return None
+    return _kernel_array(fallback), _kernel_array(anchor), _kernel_array(in_state, bool)
+
+
+def _float_list(column) -> List[float]:
+    """Kernel column as a list of Python floats (not numpy scalars)."""
+    if np is not None and isinstance(column, np.ndarray):
+        return column.tolist()
+    return list(column)
+
+
+def _score_column(current, target, tolerance) -> List[float]:
+    """`_criterion_score` of every row of a kernel column, as a list."""
+    if np is not None:
+        return _criterion_scores_np(
+            np.asarray(current, dtype=float),
+            np.asarray(target, dtype=float),
+            np.asarray(tolerance, dtype=float)
+        ).tolist()
+    return [_criterion_score(c, t, tol) for c, t, tol in zip(current, target, tolerance)]
+
+
+def _criterion_scores_np(current, target, tolerance):
+    """Vectorized `_criterion_score` over numpy columns."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        met = np.abs(current - target) <= target * tolerance
+        ratio = np.minimum(current / target, target / current)
+    # NaN and non-positive ratios (no measurement, opposite signs) score 0
+    return np.where(met, 1.0, np.where(ratio > 0.0, ratio, 0.0))
+
+
+class _GoalMember:
+    """
+    Base for objects mirrored in their goals' column buffers.
+    
+    `_owners` holds one (goal, row) pair per goal that lists the object, so
+    a criterion or constraint shared by several goals updates all of them.
+    It is a plain slot rather than a dataclass field, so it stays out of
+    fields(), asdict(), repr and comparisons.
+    """
+    
+    __slots__ = ("_owners",)
+    
+    def _set_owner(self, goal: 'Goal', index: int):
+        """Record (or move) this object's row in `goal`."""
+        owners = getattr(self, "_owners", ())
+        owners = tuple(o for o in owners if o[0] is not goal)
+        object.__setattr__(self, "_owners", owners + ((goal, index),))
+    
+    def _drop_owner(self, goal: 'Goal'):
+        """Forget `goal` after it stops listing this object."""
+        owners = getattr(self, "_owners", ())
+        object.__setattr__(
+            self, "_owners", tuple(o for o in owners if o[0] is not goal)
+        )
+
+
+class _CriterionCache(_GoalMember):
+    """
+    Float forms of a criterion's target and current value, cached on
+    assignment: NaN for a None measurement, None when the value is not
+    numeric.
+    """
+    
+    __slots__ = ("_target_f", "_current_f")
+
+
+class _ConstraintCache(_GoalMember):
+    """
+    Float forms of a constraint's limit and current value, cached like
+    `_CriterionCache`, plus whether it is hard so hot paths skip the enum
+    comparison.
+    """
+    
+    __slots__ = ("_limit_f", "_current_f", "_is_hard")
+
+
+class _GoalColumns:
+    """
+    Column buffers and memos behind a `Goal`, kept as plain slots so they
+    stay out of fields(), asdict(), repr and comparisons.
+    
+    Structure-of-arrays view of the criteria and constraints, one column
+    per attribute. Numeric rows are scored straight from the columns; rows
+    with a custom evaluator or non-numeric values fall back to the object.
+    Those rows are listed in _slow / _c_slow and hold NaN in the current
+    columns, so a column pass scores them 0 / not violated and only the
+    listed rows are revisited through their objects.
+    """
+    
+    __slots__ = (
+        "_target", "_current", "_weight", "_total_weight", "_tol", "_numeric",
+        "_limit", "_c_current", "_hard", "_c_numeric", "_slow", "_c_slow",
+        "_synced",
+        # Criteria and constraints registered as owned by this goal at last sync
+        "_members",
+        "_stale",
+        # Memoized overall_progress, invalidated whenever a current value changes
+        "_progress_cache", "_dirty",
+        # Memoized to_summary, cleared by any public field or measurement change
+        "_summary",
+    )
 
 
 class ConstraintType(Enum):
@@ -33,8 +403,8 @@ class GoalStatus(Enum):
     PARTIAL = "partial"
 
 
-@dataclass
-class SuccessCriterion:
+@dataclass(**_SLOTS)
+class SuccessCriterion(_CriterionCache):
     """
     A single criterion for goal success.
     
@@ -47,33 +417,72 @@ class SuccessCriterion:
     tolerance: float = 0.1  # Acceptable deviation
     evaluator: Optional[Callable[[Any, Any], bool]] = None
     
+    def __setattr__(self, name: str, value: Any):
+        object.__setattr__(self, name, value)
+        if name == "current_value":
+            object.__setattr__(self, "_current_f", _as_float(value))
+        elif name == "target_value":
+            # Only real numbers take the numeric path; is_satisfied_by
+            # multiplies the raw target by the tolerance
+            target = float(value) if isinstance(value, numbers.Real) else None
+            object.__setattr__(self, "_target_f", target)
+        
+        owners = getattr(self, "_owners", None)
+        if owners:
+            if name == "current_value":
+                for goal, index in owners:
+                    goal._set_current(self, index)
+            elif name in _CRITERION_LAYOUT_FIELDS:
+                for goal, _ in owners:
+                    goal._stale = True
+    
+    def _is_numeric(self) -> bool:
+        """Whether the cached floats fully determine this criterion's score."""
+        return (
+            self.evaluator is None
+            and self._target_f is not None
+            and self._current_f is not None
+        )
+    
     def is_satisfied(self) -> bool:
         """Check if criterion is satisfied."""
-        if self.current_value is None:
+        if self._is_numeric():
+            return _criterion_met(self._current_f, self._target_f, self.tolerance)
+        return self.is_satisfied_by(self.current_value)
+    
+    def is_satisfied_by(self, value: Any) -> bool:
+        """Check if criterion would be satisfied with `value` as its current value."""
+        if value is None:
             return False
         
         if self.evaluator:
-            return self.evaluator(self.current_value, self.target_value)
+            return self.evaluator(value, self.target_value)
         
         # Default: numeric comparison with tolerance
         try:
-            diff = abs(float(self.current_value) - float(self.target_value))
+            diff = abs(float(value) - float(self.target_value))
             return diff <= self.target_value * self.tolerance
         except (ValueError, TypeError):
-            return self.current_value == self.target_value
+            return value == self.target_value
     
     def satisfaction_score(self) -> float:
         """Calculate satisfaction score (0.0 to 1.0)."""
-        if self.is_satisfied():
+        if self._is_numeric():
+            return _criterion_score(self._current_f, self._target_f, self.tolerance)
+        return self.score_for(self.current_value)
+    
+    def score_for(self, value: Any) -> float:
+        """Satisfaction score the criterion would have with `value` as its current value."""
+        if self.is_satisfied_by(value):
             return 1.0
         
-        if self.current_value is None:
+        if value is None:
             return 0.0
         
         # Calculate partial satisfaction
         try:
             target = float(self.target_value)
-            current = float(self.current_value)
+            current = float(value)
             
             if target == 0:
                 return 1.0 if current == 0 else 0.0
@@ -85,8 +494,8 @@ class SuccessCriterion:
             return 0.0
 
 
-@dataclass
-class Constraint:
+@dataclass(**_SLOTS)
+class Constraint(_ConstraintCache):
     """
     A constraint that limits the agent's actions.
     
@@ -98,28 +507,71 @@ class Constraint:
     constraint_type: ConstraintType = ConstraintType.HARD
     evaluator: Optional[Callable[[Any, Any], bool]] = None
     
+    def __setattr__(self, name: str, value: Any):
+        object.__setattr__(self, name, value)
+        if name == "current":
+            object.__setattr__(self, "_current_f", _as_float(value))
+        elif name == "limit":
+            # A None limit is compared by equality, not as NaN
+            limit = None if value is None else _as_float(value)
+            object.__setattr__(self, "_limit_f", limit)
+        elif name == "constraint_type":
+            object.__setattr__(self, "_is_hard", value is ConstraintType.HARD)
+        
+        owners = getattr(self, "_owners", None)
+        if owners:
+            if name == "current":
+                for goal, index in owners:
+                    goal._set_constraint_current(self, index)
+            elif name in _CONSTRAINT_LAYOUT_FIELDS:
+                for goal, _ in owners:
+                    goal._stale = True
+    
+    def _is_numeric(self) -> bool:
+        """Whether the cached floats fully determine this constraint's state."""
+        return (
+            self.evaluator is None
+            and self._limit_f is not None
+            and self._current_f is not None
+        )
+    
     def is_violated(self) -> bool:
         """Check if constraint is violated."""
-        if self.current is None:
+        if self._is_numeric():
+            return self._current_f > self._limit_f
+        return self.is_violated_by(self.current)
+    
+    def is_violated_by(self, value: Any) -> bool:
+        """Check if constraint would be violated with `value` as its current value."""
+        if value is None:
             return False
         
         if self.evaluator:
-            return not self.evaluator(self.current, self.limit)
+            return not self.evaluator(value, self.limit)
         
         # Default: check if current exceeds limit
         try:
-            return float(self.current) > float(self.limit)
+            return float(value) > float(self.limit)
         except (ValueError, TypeError):
-            return self.current != self.limit
+            return value != self.limit
     
     def violation_severity(self) -> float:
         """Calculate violation severity (0.0 = no violation)."""
-        if not self.is_violated():
+        if self._is_numeric():
+            current, limit = self._current_f, self._limit_f
+            if not current > limit:
+                return 0.0
+            return 1.0 if limit == 0 else (current - limit) / limit
+        return self.severity_for(self.current)
+    
+    def severity_for(self, value: Any) -> float:
+        """Violation severity the constraint would have with `value` as its current value."""
+        if not self.is_violated_by(value):
             return 0.0
         
         try:
             limit = float(self.limit)
-            current = float(self.current)
+            current = float(value)
             
             if limit == 0:
                 return 1.0
@@ -129,8 +581,13 @@ class Constraint:
             return 1.0
 
 
-@dataclass
-class Goal:
+# Fields whose reassignment changes a goal's column layout
+_CRITERION_LAYOUT_FIELDS = frozenset({"name", "target_value", "weight", "tolerance", "evaluator"})
+_CONSTRAINT_LAYOUT_FIELDS = frozenset({"name", "limit", "constraint_type", "evaluator"})
+
+
+@dataclass(**_SLOTS)
+class Goal(_GoalColumns):
     """
     A declarative goal with success criteria and constraints.
     
@@ -144,29 +601,267 @@ class Goal:
     created_at: datetime = field(default_factory=datetime.utcnow)
     completed_at: Optional[datetime] = None
     
+    def __post_init__(self):
+        self._members = ()
+        self._progress_cache = 0.0
+        self._sync_arrays()
+    
+    def __setattr__(self, name: str, value: Any):
+        object.__setattr__(self, name, value)
+        # Private bookkeeping writes are the common case; keep them cheap
+        if name[0] != "_":
+            object.__setattr__(self, "_summary", None)
+            if name == "success_criteria" or name == "constraints":
+                object.__setattr__(self, "_stale", True)
+    
+    def add_criterion(self, criterion: SuccessCriterion):
+        """Add a success criterion to this goal."""
+        self.success_criteria.append(criterion)
+        self._stale = True
+    
+    def add_constraint(self, constraint: Constraint):
+        """Add a constraint to this goal."""
+        self.constraints.append(constraint)
+        self._stale = True
+    
+    def _sync_arrays(self):
+        """(Re)build the column buffers from the criteria and constraints."""
+        criteria = self.success_criteria
+        constraints = self.constraints
+        
+        currents, numeric, slow = [], [], []
+        for i, c in enumerate(criteria):
+            c._set_owner(self, i)
+            if c._is_numeric():
+                currents.append(c._current_f)
+                numeric.append(True)
+            else:
+                currents.append(_NAN)
+                numeric.append(False)
+                slow.append(i)
+        self._target = _buffer([
+            _NAN if c._target_f is None else c._target_f for c in criteria
+        ])
+        self._current = _buffer(currents)
+        weights = [float(c.weight) for c in criteria]
+        self._weight = _buffer(weights)
+        self._total_weight = sum(weights)
+        self._tol = _buffer([float(c.tolerance) for c in criteria])
+        self._numeric = _buffer(numeric)
+        self._slow = slow
+        
+        limits, c_currents, c_numeric, c_slow = [], [], [], []
+        for i, c in enumerate(constraints):
+            c._set_owner(self, i)
+            limit = c._limit_f
+            limits.append(_NAN if limit is None else limit)
+            if c._is_numeric():
+                c_currents.append(c._current_f)
+                c_numeric.append(True)
+            else:
+                c_currents.append(_NAN)
+                c_numeric.append(False)
+                c_slow.append(i)
+        self._limit = _buffer(limits)
+        self._c_current = _buffer(c_currents)
+        self._hard = _buffer([c._is_hard for c in constraints])
+        self._c_numeric = _buffer(c_numeric)
+        self._c_slow = c_slow
+        
+        # Unregister from anything this goal no longer lists
+        members = (*criteria, *constraints)
+        current_ids = {id(m) for m in members}
+        for m in self._members:
+            if id(m) not in current_ids:
+                m._drop_owner(self)
+        self._members = members
+        
+        self._synced = (criteria, len(criteria), constraints, len(constraints))
+        self._stale = False
+        self._dirty = True
+        self._summary = None
+    
+    def _ensure_synced(self):
+        """Resync if criteria or constraints were added, removed or replaced."""
+        if self._stale:
+            self._sync_arrays()
+            return
+        # Compare members by identity: items assigned in place keep the
+        # list's object and length unchanged
+        criteria, constraints = self.success_criteria, self.constraints
+        members = self._members
+        n_criteria = len(criteria)
+        if (
+            len(members) != n_criteria + len(constraints)
+            or any(m is not c for m, c in zip(members, criteria))
+            or any(m is not c for m, c in zip(members[n_criteria:], constraints))
+        ):
+            self._sync_arrays()
+    
+    def _set_current(self, criterion: SuccessCriterion, index: int):
+        """Write a criterion's new measurement (row `index`) through to the columns."""
+        criteria, n_criteria = self._synced[0], self._synced[1]
+        if self._stale or index >= n_criteria or criteria[index] is not criterion:
+            self._stale = True
+            return
+        numeric = criterion._is_numeric()
+        self._current[index] = criterion._current_f if numeric else _NAN
+        self._dirty = True
+        self._summary = None
+        if numeric != self._numeric[index]:
+            self._numeric[index] = numeric
+            self._slow = [i for i, ok in enumerate(self._numeric) if not ok]
+    
+    def _set_constraint_current(self, constraint: Constraint, index: int):
+        """Write a constraint's new measurement (row `index`) through to the columns."""
+        constraints, n_constraints = self._synced[2], self._synced[3]
+        if self._stale or index >= n_constraints or constraints[index] is not constraint:
+            self._stale = True
+            return
+        numeric = constraint._is_numeric()
+        self._c_current[index] = constraint._current_f if numeric else _NAN
+        self._summary = None
+        if numeric != self._c_numeric[index]:
+            self._c_numeric[index] = numeric
+            self._c_slow = [i for i, ok in enumerate(self._c_numeric) if not ok]
+    
+    def _criterion_scores(self) -> List[float]:
+        """Satisfaction score of every criterion, in order."""
+        if isinstance(self._current, list):
+            scores = [
+                _criterion_score(current, target, tol)
+                for current, target, tol in zip(self._current, self._target, self._tol)
+            ]
+        else:
+            scores = _criterion_scores_np(self._current, self._target, self._tol)
+        
+        criteria = self.success_criteria
+        for i in self._slow:
+            scores[i] = criteria[i].satisfaction_score()
+        return scores
+    
+    @property
+    def total_weight(self) -> float:
+        """Sum of the success criteria weights."""
+        self._ensure_synced()
+        return self._total_weight
+    
+    def _weighted_progress(self, scores) -> float:
+        """Weighted average of per-criterion scores."""
+        total_weight = self._total_weight
+        if isinstance(scores, list):
+            weighted_score = sum(s * w for s, w in zip(scores, self._weight))
+        else:
+            weighted_score = float(scores @ self._weight)
+        return weighted_score / total_weight if total_weight > 0 else 0.0
+    
     def overall_progress(self) -> float:
         """Calculate overall progress (0.0 to 1.0)."""
+        self._ensure_synced()
+        if not self._dirty:
+            return self._progress_cache
+        
+        progress = 0.0
+        if self.success_criteria:
+            progress = self._weighted_progress(self._criterion_scores())
+        
+        self._progress_cache = progress
+        self._dirty = False
+        return progress
+    
+    def progress_with(self, overrides: Mapping[str, Any]) -> float:
+        """
+        Overall progress if the criteria named in `overrides` had those values.
+        
+        Leaves the goal's own measurements untouched.
+        """
+        self._ensure_synced()
         if not self.success_criteria:
             return 0.0
         
-        total_weight = sum(c.weight for c in self.success_criteria)
-        weighted_score = sum(
-            c.satisfaction_score() * c.weight 
-            for c in self.success_criteria
-        )
+        scores = self._criterion_scores()
+        for i, criterion in enumerate(self.success_criteria):
+            if criterion.name in overrides:
+                scores[i] = criterion.score_for(overrides[criterion.name])
+        return self._weighted_progress(scores)
+    
+    def constraint_severity_with(self, overrides: Mapping[str, Any]) -> Tuple[float, float]:
+        """
+        Total (hard, soft) violation severity of the constraints named in
+        `overrides`, evaluated at those values.
         
-        return weighted_score / total_weight if total_weight > 0 else 0.0
+        Constraints not named in `overrides` are not counted.
+        """
+        self._ensure_synced()
+        hard_severity = 0.0
+        soft_severity = 0.0
+        for constraint, hard in zip(self.constraints, self._hard):
+            if constraint.name in overrides:
+                severity = constraint.severity_for(overrides[constraint.name])
+                if hard:
+                    hard_severity += severity
+                else:
+                    soft_severity += severity
+        return hard_severity, soft_severity
     
     def is_achieved(self) -> bool:
         """Check if all success criteria are satisfied."""
-        return all(c.is_satisfied() for c in self.success_criteria)
+        self._ensure_synced()
+        criteria = self.success_criteria
+        if isinstance(self._current, list):
+            return all(
+                _criterion_met(current, target, tol) if numeric
+                else criteria[i].is_satisfied()
+                for i, (current, target, tol, numeric) in enumerate(
+                    zip(self._current, self._target, self._tol, self._numeric)
+                )
+            )
+        
+        met = np.abs(self._current - self._target) <= self._target * self._tol
+        if not met[self._numeric].all():
+            return False
+        return all(criteria[i].is_satisfied() for i in self._slow)
     
     def has_violations(self) -> bool:
         """Check if any hard constraints are violated."""
-        return any(
-            c.is_violated() and c.constraint_type == ConstraintType.HARD
-            for c in self.constraints
-        )
+        self._ensure_synced()
+        if isinstance(self._c_current, list):
+            violated = any(
+                current > limit
+                for current, limit, hard in zip(self._c_current, self._limit, self._hard)
+                if hard
+            )
+        else:
+            violated = bool((self._c_current[self._hard] > self._limit[self._hard]).any())
+        if violated:
+            return True
+        
+        constraints, hard = self.constraints, self._hard
+        return any(constraints[i].is_violated() for i in self._c_slow if hard[i])
+    
+    def to_summary(self) -> Dict[str, Any]:
+        """
+        Compact status for per-iteration reporting.
+        
+        Holds id, description, status, progress and violations; use
+        `to_dict` for the per-criterion detail.
+        """
+        self._ensure_synced()
+        summary = self._summary
+        if summary is None:
+            summary = {
+                "id": self.id,
+                "description": self.description,
+                "status": self.status.value,
+                "progress": self.overall_progress(),
+                "violations": self.has_violations()
+            }
+            self._summary = summary
+        return dict(summary)
+    
+    def to_json(self) -> bytes:
+        """Encode `to_dict` as compact JSON bytes."""
+        return _encode(self.to_dict())
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -200,7 +895,45 @@ class Goal:
         }
 
 
-@dataclass
+class _RecordedState(Mapping):
+    """
+    Agent state recorded with an action history entry.
+    
+    Holds a position in the agent's per-action measurement diffs and
+    replays them on first read, so recording an action does not copy the
+    whole state.
+    """
+    
+    __slots__ = ("_diffs", "_count", "_state")
+    
+    def __init__(self, diffs: List[Dict[str, Any]], count: int):
+        self._diffs = diffs
+        self._count = count
+        self._state: Optional[Dict[str, Any]] = None
+    
+    def _materialize(self) -> Dict[str, Any]:
+        state = self._state
+        if state is None:
+            state = {}
+            for diff in self._diffs[:self._count]:
+                state.update(diff)
+            self._state = state
+        return state
+    
+    def __getitem__(self, key: str) -> Any:
+        return self._materialize()[key]
+    
+    def __iter__(self):
+        return iter(self._materialize())
+    
+    def __len__(self) -> int:
+        return len(self._materialize())
+    
+    def __repr__(self) -> str:
+        return repr(self._materialize())
+
+
+@dataclass(**_SLOTS)
 class Action:
     """An action the agent can take."""
     name: str
@@ -211,16 +944,20 @@ class Action:
     
     def predict_outcome(self, current_state: Dict[str, Any]) -> Dict[str, Any]:
         """Predict outcome of taking this action."""
-        predicted = current_state.copy()
+        return {**current_state, **self.predict_changes(current_state)}
+    
+    def predict_changes(self, current_state: Mapping[str, Any]) -> Dict[str, Any]:
+        """Predicted values of just the keys this action impacts."""
+        changes = {}
         for key, delta in self.expected_impact.items():
-            if key in predicted:
+            if key in current_state:
                 try:
-                    predicted[key] = float(predicted[key]) + float(delta)
+                    changes[key] = float(current_state[key]) + float(delta)
                 except (ValueError, TypeError):
-                    predicted[key] = delta
+                    changes[key] = delta
             else:
-                predicted[key] = delta
-        return predicted
+                changes[key] = delta
+        return changes
 
 
 class GoalDrivenAgent:
@@ -236,48 +973,142 @@ class GoalDrivenAgent:
     
     def __init__(self, name: str):
         self.name = name
+        # Progress messages go to a per-agent child of the module logger
+        self._log = logger.getChild(name)
         self.goals: Dict[str, Goal] = {}
+        # Dense goal store for the hot loops, plus each goal's position in it
+        self._goals: List[Goal] = []
+        self.goals_by_id: Dict[str, int] = {}
         self.action_history: List[Dict[str, Any]] = []
-        self.current_state: Dict[str, Any] = {}
+        # Latest measurements, exposed read-only as current_state
+        self._state: Dict[str, Any] = {}
+        # Dense mirror of _state: each key is interned to an integer slot
+        # once, then read by index when scoring. update_state is the only
+        # write path, so the two stay in step.
+        self._slots: Dict[str, int] = {}
+        self._state_vec: List[float] = []
+        self._state_kinds: List[int] = []
+        # Which criteria/constraints each state key feeds, and each goal's
+        # row slots; rebuilt when any goal's layout changes
+        self._layout_token: Tuple[Any, ...] = ()
+        self._routes: Dict[str, List[Tuple[Any, str]]] = {}
+        self._goal_slots: List[Tuple[Any, Any]] = []
+        # Measurements applied between consecutive executed actions, one
+        # entry per action; replaying the first n rebuilds the state recorded
+        # with action n. _unrecorded collects changes since the last action.
+        self._state_diffs: List[Dict[str, Any]] = []
+        self._unrecorded: Dict[str, Any] = {}
+        # Per (action, goal) impact columns, reused while neither changes.
+        # Bounded, since callers may build fresh actions for every call
+        self._impact_rows: "OrderedDict[Tuple[int, int], Tuple[Any, ...]]" = OrderedDict()
     
     def add_goal(self, goal: Goal):
         """Add a goal for the agent to pursue."""
+        index = self.goals_by_id.get(goal.id)
+        if index is None:
+            self.goals_by_id[goal.id] = len(self._goals)
+            self._goals.append(goal)
+        else:
+            self._goals[index] = goal
         self.goals[goal.id] = goal
-        print(f"🎯 Added goal: {goal.description}")
+        self._log.info("🎯 Added goal: %s", goal.description)
+    
+    @property
+    def current_state(self) -> Mapping[str, Any]:
+        """Read-only view of the latest measurements; change them with update_state."""
+        return MappingProxyType(self._state)
     
     def update_state(self, measurements: Dict[str, Any]):
         """Update current state with new measurements."""
-        self.current_state.update(measurements)
+        self._state.update(measurements)
+        self._unrecorded.update(measurements)
         
-        # Update goal criteria and constraints
-        for goal in self.goals.values():
-            for criterion in goal.success_criteria:
-                if criterion.name in measurements:
-                    criterion.current_value = measurements[criterion.name]
+        vec, kinds = self._state_vec, self._state_kinds
+        routes = self._sync_layout()
+        for name, value in measurements.items():
+            as_float = _as_float(value)
+            slot = self._slot(name)
+            vec[slot] = _NAN if as_float is None else as_float
+            kinds[slot] = _state_kind(value, as_float)
             
+            # Update goal criteria and constraints
+            for row, attr in routes.get(name, ()):
+                setattr(row, attr, value)
+    
+    def _slot(self, name: str) -> int:
+        """Integer state slot of a key, interned on first use."""
+        slot = self._slots.get(name)
+        if slot is None:
+            slot = self._slots[name] = len(self._state_vec)
+            self._state_vec.append(_NAN)
+            self._state_kinds.append(_ABSENT)
+        return slot
+    
+    def _sync_layout(self) -> Dict[str, List[Tuple[Any, str]]]:
+        """Rebuild measurement routes and goal row slots if any goal changed."""
+        token = []
+        for goal in self._goals:
+            goal._ensure_synced()
+            token.append(goal._synced)
+        if len(token) == len(self._layout_token) and all(
+            a is b for a, b in zip(token, self._layout_token)
+        ):
+            return self._routes
+        
+        routes: Dict[str, List[Tuple[Any, str]]] = {}
+        goal_slots = []
+        for goal in self._goals:
+            for criterion in goal.success_criteria:
+                routes.setdefault(criterion.name, []).append((criterion, "current_value"))
             for constraint in goal.constraints:
-                if constraint.name in measurements:
-                    constraint.current = measurements[constraint.name]
+                routes.setdefault(constraint.name, []).append((constraint, "current"))
+            goal_slots.append((
+                _buffer([self._slot(c.name) for c in goal.success_criteria]),
+                _buffer([self._slot(c.name) for c in goal.constraints]),
+            ))
+        self._routes = routes
+        self._goal_slots = goal_slots
+        self._layout_token = tuple(token)
+        return routes
     
     def evaluate_goals(self) -> Dict[str, Any]:
         """Evaluate all goals and return status."""
         results = {}
         
-        for goal_id, goal in self.goals.items():
-            # Check constraints first
-            if goal.has_violations():
-                goal.status = GoalStatus.FAILED
-            elif goal.is_achieved():
-                goal.status = GoalStatus.ACHIEVED
-                if goal.completed_at is None:
-                    goal.completed_at = datetime.utcnow()
-            elif goal.overall_progress() > 0:
-                goal.status = GoalStatus.IN_PROGRESS
-            
-            results[goal_id] = goal.to_dict()
+        for goal in self._goals:
+            self._update_status(goal)
+            results[goal.id] = goal.to_dict()
+        
+        return results
+    
+    def summarize_goals(self) -> Dict[str, Dict[str, Any]]:
+        """Evaluate all goals and return each goal's compact summary."""
+        results = {}
+        
+        for goal in self._goals:
+            self._update_status(goal)
+            results[goal.id] = goal.to_summary()
         
         return results
     
+    def _update_status(self, goal: Goal):
+        """Move a goal to the status its current measurements imply."""
+        status = goal.status
+        
+        # Check constraints first
+        if goal.has_violations():
+            status = GoalStatus.FAILED
+        elif goal.is_achieved():
+            status = GoalStatus.ACHIEVED
+            if goal.completed_at is None:
+                goal.completed_at = datetime.utcnow()
+        elif goal.overall_progress() > 0:
+            status = GoalStatus.IN_PROGRESS
+        
+        # Only write real changes so the goal's cached summary survives
+        if status is not goal.status:
+            goal.status = status
+    
     def select_action(self, available_actions: List[Action]) -> Optional[Action]:
         """
         Select the best action based on goal alignment.
@@ -288,81 +1119,301 @@ class GoalDrivenAgent:
         if not available_actions:
             return None
         
+        prepared = self._prepare_scoring()
+        bounds = None
+        if len(available_actions) >= _BOUND_MIN_ACTIONS:
+            bounds = self._score_bounds(available_actions, prepared)
+        if bounds is not None:
+            return self._select_bounded(available_actions, prepared, bounds)
+        
         best_action = None
         best_score = float('-inf')
+        scores = self._score_actions(available_actions, prepared)
         
-        for action in available_actions:
-            score = self._evaluate_action(action)
-            
+        for action, score in zip(available_actions, scores):
             if score > best_score:
                 best_score = score
                 best_action = action
         
         return best_action
     
-    def _evaluate_action(self, action: Action) -> float:
-        """Evaluate an action's expected value."""
-        # Predict outcome
-        predicted_state = action.predict_outcome(self.current_state)
+    def _select_bounded(
+        self,
+        actions: List[Action],
+        prepared: List[Tuple[Goal, Optional[Tuple[Any, ...]]]],
+        bounds: List[float]
+    ) -> Optional[Action]:
+        """
+        Branch-and-bound form of `select_action`.
+        
+        The ~sqrt(n) actions with the highest bounds are scored first; of
+        the rest, only those whose bound can still reach the best exact
+        score are scored, in one more batch. Ties go to the earliest action,
+        as in the exhaustive scan.
+        """
+        order = sorted(range(len(actions)), key=lambda a: -bounds[a])
+        head = max(_BOUND_FIRST_CHUNK, math.isqrt(len(order)))
+        best_index = None
+        best_score = float('-inf')
+        
+        def score_batch(batch: List[int]):
+            nonlocal best_index, best_score
+            scores = self._score_actions([actions[a] for a in batch], prepared)
+            for a, score in zip(batch, scores):
+                if score > best_score or (
+                    score == best_score and best_index is not None and a < best_index
+                ):
+                    best_score = score
+                    best_index = a
         
-        score = 0.0
+        score_batch(order[:head])
+        
+        rest = []
+        for a in order[head:]:
+            # Slack absorbs rounding differences between bound and score
+            slack = 1e-9 * (1.0 + abs(best_score) + abs(bounds[a]))
+            if bounds[a] + slack < best_score:
+                break
+            rest.append(a)
+        if rest:
+            score_batch(rest)
+        
+        return None if best_index is None else actions[best_index]
+    
+    def _score_bounds(
+        self,
+        actions: List[Action],
+        prepared: List[Tuple[Goal, Optional[Tuple[Any, ...]]]]
+    ) -> Optional[List[float]]:
+        """
+        Upper bound on every action's score, or None if a goal can't be bounded.
+        
+        Criterion scores lie in [0, 1], so an impacted row can gain at most
+        ``max(w, 0) - w * score(fallback)`` over the unchanged prediction, and
+        constraints with non-negative limits only ever subtract. Goals scored
+        through their criterion objects, or with a negative limit, have no
+        such bound.
+        """
+        inf = float('inf')
+        bounds = [0.0] * len(actions)
         
-        for goal in self.goals.values():
-            # Calculate progress improvement
-            current_progress = goal.overall_progress()
+        for goal, columns in prepared:
+            if columns is None:
+                return None
+            progress, total_weight, target, weight, tol, state_rows, limit = columns[:7]
+            if any(l < 0.0 for l in _float_list(limit)):
+                return None
             
-            # Temporarily update criteria with predicted values
-            original_values = {}
-            for criterion in goal.success_criteria:
-                if criterion.name in predicted_state:
-                    original_values[criterion.name] = criterion.current_value
-                    criterion.current_value = predicted_state[criterion.name]
+            gains = None
+            base = 0.0
+            if total_weight > 0.0:
+                weights = _float_list(weight)
+                scores = _score_column(state_rows[0], target, tol)
+                base = sum(w * s for w, s in zip(weights, scores)) - progress * total_weight
+                gains = [max(w, 0.0) - w * s for w, s in zip(weights, scores)]
             
-            predicted_progress = goal.overall_progress()
+            all_rows = [self._action_rows(action, goal) for action in actions]
+            present = [a for a, rows in enumerate(all_rows) if rows is not None]
+            if gains is None:
+                gained = [0.0] * len(present)
+            elif njit is not None and present:
+                # numba-era rows are numpy masks: one mask x gains product
+                mask = _stack_rows([all_rows[a][1] for a in present])
+                gained = (mask @ np.asarray(gains)).tolist()
+            else:
+                gained = [sum(gains[i] for i in all_rows[a][4]) for a in present]
             
-            # Restore original values
-            for criterion in goal.success_criteria:
-                if criterion.name in original_values:
-                    criterion.current_value = original_values[criterion.name]
+            for a, rows in enumerate(all_rows):
+                if rows is None:
+                    bounds[a] = inf
+            for a, gain in zip(present, gained):
+                bounds[a] += base + gain
+        
+        for a, action in enumerate(actions):
+            bound = bounds[a] - action.cost * 0.1 - action.risk * 5
+            # A NaN bound proves nothing, so such actions are always scored
+            bounds[a] = bound if bound == bound else inf
+        return bounds
+    
+    def _prepare_scoring(self) -> List[Tuple[Goal, Optional[Tuple[Any, ...]]]]:
+        """
+        Gather per-goal kernel columns for scoring actions against the
+        current state. Goals with non-numeric rows get None and are scored
+        through the criterion objects instead.
+        """
+        self._sync_layout()
+        state = (self._state_vec, self._state_kinds)
+        state_np = None
+        
+        def gather(slots, currents):
+            nonlocal state_np
+            if isinstance(slots, list):
+                return _state_columns(*state, slots, currents)
+            if state_np is None:
+                # Large goals index the state as arrays, converted once
+                state_np = (np.array(state[0]), np.array(state[1]))
+            return _state_columns(*state_np, slots, currents)
+        
+        prepared = []
+        for goal, (slots, c_slots) in zip(self._goals, self._goal_slots):
+            columns = None
+            if not goal._slow and not goal._c_slow:
+                criteria = gather(slots, goal._current)
+                constraints = gather(c_slots, goal._c_current)
+                if criteria is not None and constraints is not None:
+                    columns = (
+                        goal.overall_progress(),
+                        goal._total_weight,
+                        _kernel_array(goal._target),
+                        _kernel_array(goal._weight),
+                        _kernel_array(goal._tol),
+                        criteria,
+                        _kernel_array(goal._limit),
+                        constraints,
+                        _kernel_array(goal._hard, bool),
+                    )
+            prepared.append((goal, columns))
+        return prepared
+    
+    def _action_rows(self, action: Action, goal: Goal) -> Optional[Tuple[Any, ...]]:
+        """Impact columns of an action over a goal's criteria and constraints."""
+        key = (id(action), id(goal))
+        cached = self._impact_rows.get(key)
+        if (
+            cached is not None
+            and cached[0] is action
+            and cached[1] is goal._synced
+            and cached[2] is action.expected_impact
+        ):
+            self._impact_rows.move_to_end(key)
+            return cached[3]
+        
+        impact = action.expected_impact
+        criteria = _impact_columns(impact, [c.name for c in goal.success_criteria])
+        constraints = _impact_columns(impact, [c.name for c in goal.constraints])
+        rows = None
+        if criteria is not None and constraints is not None:
+            # Trailing entry: indices of the impacted criteria, for bounding
+            impacted = [i for i, hit in enumerate(criteria[1]) if hit]
+            rows = criteria + constraints + (impacted,)
+        self._impact_rows[key] = (action, goal._synced, impact, rows)
+        self._impact_rows.move_to_end(key)
+        if len(self._impact_rows) > _IMPACT_CACHE_SIZE:
+            self._impact_rows.popitem(last=False)
+        return rows
+    
+    def _evaluate_action(
+        self,
+        action: Action,
+        prepared: Optional[List[Tuple[Goal, Optional[Tuple[Any, ...]]]]] = None
+    ) -> float:
+        """Evaluate an action's expected value."""
+        if prepared is None:
+            prepared = self._prepare_scoring()
+        return self._score_actions([action], prepared)[0]
+    
+    def _score_actions(
+        self,
+        actions: List[Action],
+        prepared: List[Tuple[Goal, Optional[Tuple[Any, ...]]]]
+    ) -> List[float]:
+        """
+        Evaluate the expected value of every action.
+        
+        Each numeric goal is scored for all actions in one batch kernel call;
+        other goals go through their criterion objects action by action.
+        """
+        scores = [0.0] * len(actions)
+        predicted_states: Dict[int, Mapping[str, Any]] = {}
+        
+        for goal, columns in prepared:
+            batch, batch_rows = [], []
+            for a, action in enumerate(actions):
+                rows = self._action_rows(action, goal) if columns is not None else None
+                if rows is not None:
+                    batch.append(a)
+                    batch_rows.append(rows)
+                    continue
+                
+                # Predict outcome
+                predicted_state = predicted_states.get(a)
+                if predicted_state is None:
+                    # Overlay the impacted keys instead of copying the state
+                    predicted_state = ChainMap(
+                        action.predict_changes(self._state), self._state
+                    )
+                    predicted_states[a] = predicted_state
+                scores[a] = self._score_goal_objects(scores[a], goal, predicted_state)
             
-            # Add improvement weighted by criterion weights
-            improvement = predicted_progress - current_progress
-            score += improvement * sum(c.weight for c in goal.success_criteria)
+            if not batch:
+                continue
             
-            # Penalize constraint violations
-            for constraint in goal.constraints:
-                if constraint.name in predicted_state:
-                    original = constraint.current
-                    constraint.current = predicted_state[constraint.name]
-                    
-                    if constraint.is_violated():
-                        severity = constraint.violation_severity()
-                        if constraint.constraint_type == ConstraintType.HARD:
-                            score -= severity * 1000  # Heavy penalty
-                        else:
-                            score -= severity * 10
-                    
-                    constraint.current = original
+            (
+                progress, total_weight, target, weight, tol, state_rows, limit,
+                c_state_rows, hard,
+            ) = columns
+            fallback, anchor, _ = state_rows
+            c_fallback, c_anchor, c_in_state = c_state_rows
+            deltas, impacted, c_deltas, c_impacted = (
+                _stack_rows([rows[k] for rows in batch_rows]) for k in range(4)
+            )
+            batch_scores = _kernel_array([scores[a] for a in batch])
+            kernel = _score_goal_rows
+            if (
+                njit is None and np is not None
+                and len(batch) * (len(target) + len(limit)) >= _NUMPY_MIN_BATCH
+            ):
+                batch_scores = np.array(batch_scores)
+                kernel = _score_goal_rows_np
+            kernel(
+                batch_scores, progress, total_weight, target, weight, tol, fallback,
+                anchor, deltas, impacted, limit, c_fallback, c_anchor, c_deltas,
+                c_impacted, c_in_state, hard
+            )
+            for a, score in zip(batch, batch_scores):
+                scores[a] = float(score)
         
         # Consider cost and risk
-        score -= action.cost * 0.1
-        score -= action.risk * 5
+        for a, action in enumerate(actions):
+            scores[a] -= action.cost * 0.1
+            scores[a] -= action.risk * 5
+        
+        return scores
+    
+    def _score_goal_objects(
+        self, score: float, goal: Goal, predicted_state: Mapping[str, Any]
+    ) -> float:
+        """Add one goal's contribution to an action score via its criterion objects."""
+        # Calculate progress improvement
+        current_progress = goal.overall_progress()
+        predicted_progress = goal.progress_with(predicted_state)
+        
+        # Add improvement weighted by criterion weights
+        improvement = predicted_progress - current_progress
+        score += improvement * goal.total_weight
+        
+        # Penalize constraint violations
+        hard_severity, soft_severity = goal.constraint_severity_with(predicted_state)
+        score -= hard_severity * 1000  # Heavy penalty
+        score -= soft_severity * 10
         
         return score
     
     def execute_action(self, action: Action) -> Dict[str, Any]:
         """Execute an action and record the result."""
-        print(f"⚡ Executing: {action.name}")
-        print(f"   Expected impact: {action.expected_impact}")
+        self._log.info("⚡ Executing: %s", action.name)
+        self._log.info("   Expected impact: %s", action.expected_impact)
         
         # In real implementation, this would actually execute the action
         # Here we simulate the effect
         self.update_state(action.expected_impact)
+        self._state_diffs.append(self._unrecorded)
+        self._unrecorded = {}
         
         execution_record = {
             "action": action.name,
-            "timestamp": datetime.utcnow().isoformat(),
-            "state_before": self.current_state.copy(),
+            "timestamp": _ns_to_iso(time.time_ns()),
+            "state_before": _RecordedState(self._state_diffs, len(self._state_diffs)),
             "expected_impact": action.expected_impact,
             "cost": action.cost,
             "risk": action.risk
@@ -372,19 +1423,30 @@ class GoalDrivenAgent:
         
         return execution_record
     
+    def export_history(self) -> List[Dict[str, Any]]:
+        """Action history as plain dicts (recorded states copied), ready for JSON."""
+        exported = []
+        state: Dict[str, Any] = {}
+        # Records and diffs line up one to one, so replay each diff once
+        for record, diff in zip(self.action_history, self._state_diffs):
+            state.update(diff)
+            exported.append({**record, "state_before": dict(state)})
+        return exported
+    
     def run(self, available_actions: List[Action], max_iterations: int = 10):
         """
         Run the agent until goals are achieved or max iterations reached.
         """
-        print(f"\n🚀 Starting Goal-Driven Agent: {self.name}")
-        print("=" * 60)
+        log = self._log
+        log.info("\n🚀 Starting Goal-Driven Agent: %s", self.name)
+        log.info("=" * 60)
         
         for iteration in range(max_iterations):
-            print(f"\n📊 Iteration {iteration + 1}/{max_iterations}")
-            print("-" * 60)
+            log.info("\n📊 Iteration %d/%d", iteration + 1, max_iterations)
+            log.info("-" * 60)
             
             # Evaluate current state
-            goal_status = self.evaluate_goals()
+            goal_status = self.summarize_goals()
             
             # Check if all goals achieved
             all_achieved = all(
@@ -392,35 +1454,38 @@ class GoalDrivenAgent:
             )
             
             if all_achieved:
-                print("\n🎉 All goals achieved!")
+                log.info("\n🎉 All goals achieved!")
                 break
             
             # Print goal status
             for goal_id, status in goal_status.items():
-                print(f"\n🎯 {status['description']}")
-                print(f"   Progress: {status['progress']:.1%}")
-                print(f"   Status: {status['status']}")
+                log.info("\n🎯 %s", status['description'])
+                log.info("   Progress: %.1f%%", status['progress'] * 100)
+                log.info("   Status: %s", status['status'])
                 
                 if status['violations']:
-                    print(f"   ⚠️  Constraint violations detected!")
+                    log.info("   ⚠️  Constraint violations detected!")
             
             # Select and execute best action
             action = self.select_action(available_actions)
             
             if action is None:
-                print("\n❌ No suitable action found")
+                log.info("\n❌ No suitable action found")
                 break
             
             self.execute_action(action)
         
-        print("\n" + "=" * 60)
-        print("Run complete!")
-        print(f"Actions taken: {len(self.action_history)}")
+        log.info("\n" + "=" * 60)
+        log.info("Run complete!")
+        log.info("Actions taken: %d", len(self.action_history))
         
         # Final goal status
         final_status = self.evaluate_goals()
         for goal_id, status in final_status.items():
-            print(f"\n🎯 {status['description']}: {status['status']} ({status['progress']:.1%})")
+            log.info(
+                "\n🎯 %s: %s (%.1f%%)",
+                status['description'], status['status'], status['progress'] * 100
+            )
         
         return final_status
 
@@ -540,4 +1605,5 @@ def demo():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     agent, status = demo()
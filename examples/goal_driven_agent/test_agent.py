@@ -2,7 +2,10 @@
 Unit tests for Goal-Driven Agent.
 """
 
+import json
 import unittest
+from dataclasses import asdict
+from datetime import datetime
 from goal_driven_agent import (
     GoalDrivenAgent,
     Goal,
@@ -46,6 +49,22 @@ class TestSuccessCriterion(unittest.TestCase):
         )
         self.assertFalse(criterion.is_satisfied())
         self.assertEqual(criterion.satisfaction_score(), 0.5)  # 2.0/4.0
+    
+    def test_cached_float_follows_assignment(self):
+        """Test that reassigned values are re-converted for numeric checks."""
+        criterion = SuccessCriterion(name="score", target_value=5)
+        self.assertEqual(criterion.satisfaction_score(), 0.0)
+        
+        criterion.current_value = "5"
+        self.assertTrue(criterion.is_satisfied())
+        
+        criterion.current_value = "n/a"
+        self.assertFalse(criterion.is_satisfied())
+        self.assertEqual(criterion.satisfaction_score(), 0.0)
+        
+        criterion.target_value = 10
+        criterion.current_value = 5.0
+        self.assertEqual(criterion.satisfaction_score(), 0.5)
 
 
 class TestConstraint(unittest.TestCase):
@@ -86,6 +105,19 @@ class TestGoal(unittest.TestCase):
         self.assertEqual(goal.id, "test_goal")
         self.assertEqual(goal.status, GoalStatus.PENDING)
     
+    def test_empty_goal_grows_on_add(self):
+        """Test that a goal created empty can be grown either way."""
+        goal = Goal(id="test", description="Test")
+        self.assertEqual(goal.success_criteria, [])
+        self.assertEqual(goal.overall_progress(), 0.0)
+        
+        goal.add_criterion(SuccessCriterion(name="c1", target_value=10, current_value=5))
+        goal.constraints.append(Constraint(name="budget", limit=10, current=20))
+        
+        self.assertEqual(goal.overall_progress(), 0.5)
+        self.assertTrue(goal.has_violations())
+        self.assertEqual(Goal(id="other", description="Other").constraints, [])
+    
     def test_overall_progress(self):
         """Test overall progress calculation."""
         goal = Goal(
@@ -131,6 +163,114 @@ class TestGoal(unittest.TestCase):
         )
         self.assertTrue(goal.is_achieved())
     
+    def test_progress_tracks_criterion_updates(self):
+        """Test that cached columns follow writes and added criteria."""
+        criterion = SuccessCriterion(name="c1", target_value=100, current_value=50)
+        goal = Goal(id="test", description="Test", success_criteria=[criterion])
+        self.assertEqual(goal.overall_progress(), 0.5)
+        
+        criterion.current_value = 100
+        self.assertEqual(goal.overall_progress(), 1.0)
+        
+        goal.add_criterion(SuccessCriterion(name="c2", target_value=10, current_value="n/a"))
+        self.assertEqual(goal.overall_progress(), 0.5)
+        self.assertFalse(goal.is_achieved())
+    
+    def test_total_weight_follows_criteria(self):
+        """Test that the cached weight sum tracks weight changes and additions."""
+        criterion = SuccessCriterion(name="c1", target_value=100, weight=0.5)
+        goal = Goal(id="test", description="Test", success_criteria=[criterion])
+        self.assertEqual(goal.total_weight, 0.5)
+        
+        criterion.weight = 2
+        goal.add_criterion(SuccessCriterion(name="c2", target_value=10, weight=1))
+        self.assertEqual(goal.total_weight, 3.0)
+    
+    def test_progress_cached_until_state_changes(self):
+        """Test that overall progress is memoized between measurements."""
+        agent = GoalDrivenAgent("Test")
+        goal = Goal(
+            id="g1",
+            description="Test",
+            success_criteria=[SuccessCriterion(name="metric", target_value=100)]
+        )
+        agent.add_goal(goal)
+        agent.update_state({"metric": 50})
+        
+        self.assertEqual(goal.overall_progress(), 0.5)
+        self.assertFalse(goal._dirty)
+        
+        agent.update_state({"metric": 25})
+        self.assertTrue(goal._dirty)
+        self.assertEqual(goal.overall_progress(), 0.25)
+    
+    def test_non_numeric_rows_follow_measurements(self):
+        """Test rows moving between the column and object scoring paths."""
+        criterion = SuccessCriterion(name="metric", target_value=100, current_value=50)
+        constraint = Constraint(
+            name="budget", limit=10, current=5, constraint_type=ConstraintType.HARD
+        )
+        goal = Goal(
+            id="g1",
+            description="Test",
+            success_criteria=[criterion],
+            constraints=[constraint]
+        )
+        self.assertEqual(goal._slow, [])
+        
+        criterion.current_value = "n/a"
+        constraint.current = "n/a"
+        self.assertEqual(goal._slow, [0])
+        self.assertEqual(goal._c_slow, [0])
+        self.assertEqual(goal.overall_progress(), 0.0)
+        self.assertTrue(goal.has_violations())
+        
+        criterion.current_value = 100
+        constraint.current = 5
+        self.assertEqual(goal._slow, [])
+        self.assertEqual(goal._c_slow, [])
+        self.assertEqual(goal.overall_progress(), 1.0)
+        self.assertFalse(goal.has_violations())
+    
+    def test_large_goal_matches_per_criterion_scores(self):
+        """Test that the column path agrees with the per-criterion methods."""
+        criteria = [
+            SuccessCriterion(
+                name=f"c{i}",
+                target_value=(i % 5) * 2.0,
+                current_value=None if i % 7 == 0 else i % 11 - 2,
+                weight=1.0 + i % 3,
+                evaluator=(lambda cur, tgt: cur >= tgt) if i % 13 == 0 else None
+            )
+            for i in range(200)
+        ]
+        goal = Goal(id="big", description="Many criteria", success_criteria=criteria)
+        
+        expected = (
+            sum(c.satisfaction_score() * c.weight for c in criteria)
+            / sum(c.weight for c in criteria)
+        )
+        self.assertAlmostEqual(goal.overall_progress(), expected)
+        self.assertEqual(goal.is_achieved(), all(c.is_satisfied() for c in criteria))
+    
+    def test_progress_with_overrides_is_pure(self):
+        """Test hypothetical progress and severity leave measurements untouched."""
+        goal = Goal(
+            id="test",
+            description="Test",
+            success_criteria=[
+                SuccessCriterion(name="c1", target_value=100, current_value=50),
+                SuccessCriterion(name="c2", target_value=10, current_value=10)
+            ],
+            constraints=[Constraint(name="budget", limit=100, current=50)]
+        )
+        
+        self.assertEqual(goal.progress_with({"c1": 100}), 1.0)
+        self.assertEqual(goal.constraint_severity_with({"budget": 150}), (0.5, 0.0))
+        self.assertEqual(goal.success_criteria[0].current_value, 50)
+        self.assertEqual(goal.overall_progress(), 0.75)
+        self.assertFalse(goal.has_violations())
+    
     def test_has_violations(self):
         """Test constraint violation detection."""
         goal = Goal(
@@ -146,6 +286,67 @@ class TestGoal(unittest.TestCase):
             ]
         )
         self.assertTrue(goal.has_violations())
+        
+        goal.constraints[0].constraint_type = ConstraintType.SOFT
+        self.assertFalse(goal.has_violations())
+    
+    def test_shared_rows_update_every_goal(self):
+        """Test that a criterion or constraint shared by two goals updates both."""
+        criterion = SuccessCriterion(name="metric", target_value=10.0)
+        budget = Constraint(name="budget", limit=100)
+        a = Goal(id="a", description="A", success_criteria=[criterion], constraints=[budget])
+        b = Goal(id="b", description="B", success_criteria=[criterion], constraints=[budget])
+        
+        criterion.current_value = 10.0
+        budget.current = 500
+        
+        self.assertEqual([a.overall_progress(), b.overall_progress()], [1.0, 1.0])
+        self.assertEqual([a.has_violations(), b.has_violations()], [True, True])
+        self.assertEqual(asdict(a)["success_criteria"][0]["current_value"], 10.0)
+    
+    def test_asdict_has_only_public_fields(self):
+        """Test that cached floats and column buffers stay out of asdict."""
+        goal = Goal(
+            id="test",
+            description="Test",
+            success_criteria=[SuccessCriterion(name="a", target_value=10, current_value=5)],
+            constraints=[Constraint(name="budget", limit=100, current=50)]
+        )
+        goal.overall_progress()
+        data = asdict(goal)
+        
+        self.assertEqual(
+            set(data),
+            {"id", "description", "success_criteria", "constraints", "status",
+             "created_at", "completed_at"}
+        )
+        self.assertFalse(any(k.startswith("_") for k in data["success_criteria"][0]))
+        self.assertFalse(any(k.startswith("_") for k in data["constraints"][0]))
+        self.assertNotIn("_target", repr(goal))
+    
+    def test_rows_replaced_in_place_are_resynced(self):
+        """Test that assigning or swapping list items is picked up."""
+        budget = Constraint(name="budget", limit=100, current=50)
+        goal = Goal(
+            id="test",
+            description="Test",
+            success_criteria=[SuccessCriterion(name="a", target_value=10, current_value=10)],
+            constraints=[budget]
+        )
+        self.assertTrue(goal.is_achieved())
+        self.assertFalse(goal.has_violations())
+        
+        goal.success_criteria[0] = SuccessCriterion(name="a", target_value=10, current_value=5)
+        goal.constraints.pop()
+        goal.constraints.append(Constraint(name="budget", limit=100, current=500))
+        
+        self.assertEqual(goal.overall_progress(), 0.5)
+        self.assertFalse(goal.is_achieved())
+        self.assertTrue(goal.has_violations())
+        
+        # The replaced constraint no longer reaches the goal
+        budget.current = 1000
+        self.assertEqual(goal.to_dict()["constraints"][0]["current"], 500)
 
 
 class TestAction(unittest.TestCase):
@@ -171,6 +372,24 @@ class TestAction(unittest.TestCase):
         
         self.assertEqual(predicted["response_time"], 8.0)
         self.assertEqual(predicted["cost"], 15.0)
+    
+    def test_predict_changes(self):
+        """Test that only impacted keys are predicted and the state is untouched."""
+        action = Action(
+            name="test_action",
+            description="Test",
+            expected_impact={"cost": -5.0, "staff": 1, "mode": "auto"}
+        )
+        current_state = {"cost": 20.0, "mode": None, "region": "eu"}
+        
+        changes = action.predict_changes(current_state)
+        
+        self.assertEqual(changes, {"cost": 15.0, "staff": 1, "mode": "auto"})
+        self.assertEqual(current_state, {"cost": 20.0, "mode": None, "region": "eu"})
+        self.assertEqual(
+            action.predict_outcome(current_state),
+            {"cost": 15.0, "mode": "auto", "region": "eu", "staff": 1}
+        )
 
 
 class TestGoalDrivenAgent(unittest.TestCase):
@@ -192,6 +411,28 @@ class TestGoalDrivenAgent(unittest.TestCase):
         self.assertIn("g1", agent.goals)
         self.assertEqual(agent.goals["g1"].description, "Test goal")
     
+    def test_progress_is_logged(self):
+        """Test that progress messages go to the agent's logger."""
+        agent = GoalDrivenAgent("Test")
+        
+        with self.assertLogs(agent._log, level="INFO") as logs:
+            agent.add_goal(Goal(id="g1", description="Test goal"))
+        
+        self.assertEqual(logs.records[0].getMessage(), "🎯 Added goal: Test goal")
+    
+    def test_re_adding_goal_replaces_in_place(self):
+        """Test that a goal re-added under its id keeps its position."""
+        agent = GoalDrivenAgent("Test")
+        agent.add_goal(Goal(id="g1", description="First"))
+        agent.add_goal(Goal(id="g2", description="Second"))
+        agent.add_goal(Goal(id="g1", description="Replaced"))
+        
+        self.assertEqual(agent.goals_by_id, {"g1": 0, "g2": 1})
+        self.assertEqual(
+            [g["description"] for g in agent.evaluate_goals().values()],
+            ["Replaced", "Second"]
+        )
+    
     def test_update_state(self):
         """Test state updates."""
         agent = GoalDrivenAgent("Test")
@@ -208,6 +449,25 @@ class TestGoalDrivenAgent(unittest.TestCase):
         
         self.assertEqual(agent.current_state["metric"], 50)
         self.assertEqual(goal.success_criteria[0].current_value, 50)
+        
+        # State only changes through update_state
+        with self.assertRaises(TypeError):
+            agent.current_state["metric"] = 100
+    
+    def test_update_state_reaches_rows_added_later(self):
+        """Test that measurements follow criteria added after registration."""
+        agent = GoalDrivenAgent("Test")
+        goal = Goal(id="g1", description="Test")
+        agent.add_goal(goal)
+        agent.update_state({"metric": 50})
+        
+        goal.add_criterion(SuccessCriterion(name="metric", target_value=100))
+        goal.add_constraint(Constraint(name="budget", limit=10))
+        agent.update_state({"metric": 80, "budget": 20})
+        
+        self.assertEqual(goal.success_criteria[0].current_value, 80)
+        self.assertEqual(goal.constraints[0].current, 20)
+        self.assertEqual(agent._state_vec[agent._slots["metric"]], 80.0)
     
     def test_evaluate_goals(self):
         """Test goal evaluation."""
@@ -230,6 +490,32 @@ class TestGoalDrivenAgent(unittest.TestCase):
         self.assertEqual(results["g1"]["status"], "achieved")
         self.assertTrue(results["g1"]["achieved"])
     
+    def test_summarize_goals(self):
+        """Test that goal summaries are cached until a measurement changes."""
+        agent = GoalDrivenAgent("Test")
+        goal = Goal(
+            id="g1",
+            description="Test",
+            success_criteria=[SuccessCriterion(name="metric", target_value=100)],
+            constraints=[Constraint(name="budget", limit=10)]
+        )
+        agent.add_goal(goal)
+        agent.update_state({"metric": 50, "budget": 5})
+        
+        summary = agent.summarize_goals()["g1"]
+        self.assertEqual(summary["status"], "in_progress")
+        self.assertEqual(summary["progress"], 0.5)
+        self.assertFalse(summary["violations"])
+        self.assertIsNotNone(goal._summary)
+        
+        agent.summarize_goals()
+        self.assertIsNotNone(goal._summary)
+        
+        agent.update_state({"budget": 20})
+        self.assertIsNone(goal._summary)
+        self.assertEqual(agent.summarize_goals()["g1"]["status"], "failed")
+        self.assertEqual(json.loads(goal.to_json()), goal.to_dict())
+    
     def test_select_action(self):
         """Test action selection."""
         agent = GoalDrivenAgent("Test")
@@ -266,6 +552,72 @@ class TestGoalDrivenAgent(unittest.TestCase):
         
         self.assertIsNotNone(selected)
         self.assertEqual(selected.name, "good_action")
+        
+        # Fresh actions per call must not grow the impact cache without bound
+        for i in range(1100):
+            agent.select_action([Action(f"a{i}", "", expected_impact={"metric": i})])
+        self.assertLessEqual(len(agent._impact_rows), 1024)
+    
+    def test_numeric_scoring_matches_object_scoring(self):
+        """Test the numeric kernel scores actions like the criterion objects."""
+        agent = GoalDrivenAgent("Test")
+        goal = Goal(
+            id="g1",
+            description="Test",
+            success_criteria=[
+                SuccessCriterion(name="latency", target_value=2.0, weight=0.6),
+                SuccessCriterion(name="quality", target_value=4.5, weight=0.4)
+            ],
+            constraints=[
+                Constraint(name="budget", limit=100.0),
+                Constraint(name="staff", limit=3, constraint_type=ConstraintType.SOFT)
+            ]
+        )
+        agent.add_goal(goal)
+        agent.update_state({"latency": 8.0, "quality": 3.0, "budget": 40.0, "staff": 2})
+        action = Action(
+            name="expand",
+            description="Hire and spend",
+            expected_impact={"latency": -5.0, "quality": 1.0, "budget": 90.0, "staff": 2},
+            cost=20.0,
+            risk=0.1
+        )
+        
+        expected = agent._score_goal_objects(
+            0.0, goal, action.predict_outcome(agent.current_state)
+        ) - action.cost * 0.1 - action.risk * 5
+        
+        self.assertAlmostEqual(agent._evaluate_action(action), expected)
+        self.assertEqual(goal.success_criteria[0].current_value, 8.0)
+    
+    def test_bounded_selection_matches_exhaustive(self):
+        """Test that ranking a large action pool by score bounds picks the true best."""
+        agent = GoalDrivenAgent("Test")
+        agent.add_goal(Goal(
+            id="g1",
+            description="Test",
+            success_criteria=[
+                SuccessCriterion(name=f"m{i}", target_value=10.0, weight=1 + i % 3)
+                for i in range(8)
+            ],
+            constraints=[Constraint(name="budget", limit=100.0)]
+        ))
+        agent.update_state({f"m{i}": 2.0 + i for i in range(8)})
+        agent.update_state({"budget": 50.0})
+        actions = [
+            Action(
+                name=f"a{j}",
+                description="Test",
+                expected_impact={f"m{j % 8}": (j % 5) - 1.0, "budget": 7.0 * (j % 11)},
+                cost=float(j % 13) * 5,
+                risk=(j % 4) / 10
+            )
+            for j in range(60)
+        ]
+        
+        scores = [agent._evaluate_action(action) for action in actions]
+        
+        self.assertIs(agent.select_action(actions), actions[scores.index(max(scores))])
 
 
 class TestIntegration(unittest.TestCase):
@@ -315,6 +667,23 @@ class TestIntegration(unittest.TestCase):
         
         # Check history
         self.assertEqual(len(agent.action_history), 1)
+        record = agent.action_history[0]
+        datetime.fromisoformat(record["timestamp"])
+        
+        # Recorded state is rebuilt from per-action diffs rather than copied
+        self.assertEqual(record["state_before"], {"metric": 25})
+        agent.update_state({"metric": 90, "cost": 3})
+        self.assertEqual(record["state_before"], {"metric": 25})
+        agent.execute_action(action)
+        self.assertEqual(agent.action_history[1]["state_before"], {"metric": 25, "cost": 3})
+        self.assertEqual(len(agent._state_diffs), 2)
+        
+        exported = agent.export_history()
+        self.assertEqual(exported[0]["action"], "increment")
+        self.assertEqual(
+            [r["state_before"] for r in exported], [{"metric": 25}, {"metric": 25, "cost": 3}]
+        )
+        json.dumps(exported)
 
 
 if __name__ == "__main__":
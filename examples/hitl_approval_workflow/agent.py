@@ -9,16 +9,60 @@ This example is designed to work with the Hive framework's HITL capabilities.
 
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, List, Tuple
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
+import asyncio
 import logging
+import os
+import sys
+import threading
 import time
 import json
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+try:
+    import orjson
+    
+    def _dumps(obj: Any) -> str:
+        """Serialize to indented JSON with orjson (C-accelerated)."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    def _dumps(obj: Any) -> str:
+        """Serialize to indented JSON with the stdlib encoder."""
+        return json.dumps(obj, indent=2)
+
 logger = logging.getLogger(__name__)
 
+_EPOCH = datetime(1970, 1, 1)
+
+# dataclass(slots=True) needs Python 3.10+; older versions keep __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _epoch_to_datetime(ts: float) -> datetime:
+    """Convert epoch seconds to a naive UTC datetime."""
+    return _EPOCH + timedelta(seconds=ts)
+
+
+def _ns_to_iso(ts_ns: int) -> str:
+    """Format an epoch-nanosecond timestamp as a naive UTC ISO-8601 string."""
+    return (_EPOCH + timedelta(microseconds=ts_ns // 1000)).isoformat()
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """The event loop running in this thread, if any."""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _set_waiter(waiter: asyncio.Future, response: 'HITLResponse'):
+    """Resolve a waiter's future unless it already finished."""
+    if not waiter.done():
+        waiter.set_result(response)
+
 
 class ApprovalStatus(Enum):
     """Status of the approval request."""
@@ -30,6 +74,11 @@ class ApprovalStatus(Enum):
     ESCALATED = "escalated"
 
 
+# Plain dict lookup for the hot logging / result paths; Enum.value goes
+# through a descriptor on every access
+_STATUS_VALUE = {status: status.value for status in ApprovalStatus}
+
+
 class InputType(Enum):
     """Types of HITL input supported."""
     FREE_TEXT = "free_text"
@@ -39,27 +88,43 @@ class InputType(Enum):
     RICH_CONTENT = "rich_content"
 
 
-@dataclass
+# HITLRequest._state values: one int read tells a waiter whether and how
+# the request was resolved
+_PENDING, _RESPONDED, _EXPIRED = 0, 1, 2
+
+
+@dataclass(**_SLOTS)
 class HITLRequest:
     """Represents a HITL approval request."""
     request_id: str
     draft_content: str
     context: Dict[str, Any] = field(default_factory=dict)
     timeout_minutes: int = 5
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    # Epoch seconds; created_at_dt converts on demand
+    created_at: float = field(default_factory=time.time)
     input_types: list = field(default_factory=lambda: [
         InputType.FREE_TEXT,
         InputType.SELECTION_LIST,
         InputType.APPROVAL_GATE
     ])
+    # Monotonic expiry deadline, fixed at construction; created_at is for audit
+    _deadline: float = field(init=False, repr=False, compare=False, default=0.0)
+    _state: int = field(init=False, repr=False, compare=False, default=_PENDING)
+    
+    def __post_init__(self):
+        self._deadline = time.monotonic() + self.timeout_minutes * 60
+    
+    @property
+    def created_at_dt(self) -> datetime:
+        """created_at as a naive UTC datetime."""
+        return _epoch_to_datetime(self.created_at)
     
     def is_expired(self) -> bool:
         """Check if the request has timed out."""
-        elapsed = datetime.utcnow() - self.created_at
-        return elapsed > timedelta(minutes=self.timeout_minutes)
+        return time.monotonic() >= self._deadline
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class HITLResponse:
     """Represents a human response to a HITL request."""
     request_id: str
@@ -68,16 +133,26 @@ class HITLResponse:
     feedback: Optional[str] = None
     modified_content: Optional[str] = None
     response_data: Dict[str, Any] = field(default_factory=dict)
-    responded_at: datetime = field(default_factory=datetime.utcnow)
+    responded_at: float = field(default_factory=time.time)
+    
+    @property
+    def responded_at_dt(self) -> datetime:
+        """responded_at as a naive UTC datetime."""
+        return _epoch_to_datetime(self.responded_at)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class EscalationResult:
     """Result when a request needs escalation."""
     reason: str
     original_request: HITLRequest
     fallback_action: str
-    escalation_time: datetime = field(default_factory=datetime.utcnow)
+    escalation_time: float = field(default_factory=time.time)
+    
+    @property
+    def escalation_time_dt(self) -> datetime:
+        """escalation_time as a naive UTC datetime."""
+        return _epoch_to_datetime(self.escalation_time)
 
 
 class HITLHandler:
@@ -91,15 +166,50 @@ class HITLHandler:
         self,
         timeout_minutes: int = 5,
         escalation_enabled: bool = True,
-        escalation_callback: Optional[Callable] = None
+        escalation_callback: Optional[Callable] = None,
+        history_limit: int = 1024,
+        audit_maxlen: int = 10_000,
+        audit_sink: Optional[Callable[[Tuple[str, int, Dict[str, Any]]], None]] = None,
+        audit_enabled: bool = True
     ):
         self.timeout_minutes = timeout_minutes
         self.escalation_enabled = escalation_enabled
         self.escalation_callback = escalation_callback
+        # Requests leave pending_requests once answered or timed out; their
+        # final responses are kept, oldest first, up to history_limit
         self.pending_requests: Dict[str, HITLRequest] = {}
-        self.responses: Dict[str, HITLResponse] = {}
-        self.audit_log: list = []
+        self.responses: "OrderedDict[str, HITLResponse]" = OrderedDict()
+        self.history_limit = history_limit
+        # Recent (event, ts_ns, data) tuples only; pass audit_sink to
+        # persist every event
+        self.audit_log: deque = deque(maxlen=audit_maxlen)
+        self.audit_sink = audit_sink
+        # Checked at each call site so a disabled audit does not even build
+        # the event's data dict
+        self._audit_enabled = audit_enabled
+        # One [loop, future, waiter count] per request with async waiters;
+        # submit_response resolves the future with the response itself, on
+        # its loop's thread. The last waiter to leave removes the entry.
+        self._waiters: Dict[str, List[Any]] = {}
+        self._thread_events: Dict[str, threading.Event] = {}
+        # Guards each request's move out of pending: waiters and
+        # submit_response may race on different threads, and only the first
+        # may answer or time it out
+        self._lock = threading.Lock()
+        self.last_request_id: Optional[str] = None
+        # Called with each new request, e.g. to notify a review UI or to
+        # answer inline in tests and simulations
+        self.on_request_created: Optional[Callable[[HITLRequest], None]] = None
+        # Escalation callbacks may do network I/O; run them off the waiter's
+        # path (threads are only started on first use)
+        self._escalation_executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="hitl-esc"
+        )
         
+    def close(self):
+        """Wait for queued escalation callbacks and release their threads."""
+        self._escalation_executor.shutdown(wait=True)
+    
     def create_request(
         self,
         draft_content: str,
@@ -114,82 +224,169 @@ class HITLHandler:
             timeout_minutes=self.timeout_minutes
         )
         self.pending_requests[request.request_id] = request
+        self.last_request_id = request.request_id
         
-        self._log_event("request_created", {
-            "request_id": request.request_id,
-            "timeout": self.timeout_minutes
-        })
+        if self._audit_enabled:
+            self._log_event("request_created", {
+                "request_id": request.request_id,
+                "timeout": self.timeout_minutes
+            })
         
-        logger.info(f"HITL request created: {request.request_id}")
+        logger.info("HITL request created: %s", request.request_id)
+        if self.on_request_created is not None:
+            self.on_request_created(request)
         return request
     
-    def wait_for_response(
-        self,
-        request_id: str,
-        poll_interval: float = 1.0
-    ) -> Optional[HITLResponse]:
+    async def wait_for_response(self, request_id: str) -> Optional[HITLResponse]:
         """
         Wait for human response with timeout handling.
         
-        In production, this would integrate with actual HITL UI/API.
-        This example uses polling for demonstration.
+        Awaits the request's future, which submit_response resolves with
+        the response, so it is seen as soon as it arrives. The timeout
+        counts from the request's creation.
         """
         request = self.pending_requests.get(request_id)
         if not request:
-            logger.error(f"Request not found: {request_id}")
+            if request_id in self.responses:
+                # Already answered: return without scheduling a wait
+                return self._receive_response(self.responses[request_id])
+            logger.error("Request not found: %s", request_id)
             return None
         
-        logger.info(f"Waiting for response on request: {request_id}")
+        logger.info("Waiting for response on request: %s", request_id)
+        
+        # Created here rather than in create_request so the future belongs
+        # to the running loop; shared by every waiter on this request
+        entry = self._waiters.get(request_id)
+        if entry is None:
+            loop = asyncio.get_running_loop()
+            entry = self._waiters[request_id] = [loop, loop.create_future(), 0]
+        entry[2] += 1
+        try:
+            if request._state != _PENDING:
+                # Answered from another thread before the future was registered
+                return self._receive_response(self.responses[request_id])
+            # shield: a waiter that times out or is cancelled must not cancel
+            # the future the other waiters share
+            response = await asyncio.wait_for(
+                asyncio.shield(entry[1]), self._remaining(request)
+            )
+        except asyncio.TimeoutError:
+            return self._expire(request)
+        finally:
+            entry[2] -= 1
+            if not entry[2]:
+                self._waiters.pop(request_id, None)
+        
+        return self._receive_response(response)
+    
+    def wait_for_response_blocking(self, request_id: str) -> Optional[HITLResponse]:
+        """
+        Blocking variant of wait_for_response for callers without an event loop.
         
-        # Simulate waiting (in production, this would be async/await with real HITL)
-        start_time = datetime.utcnow()
-        while not request.is_expired():
+        Parks the calling thread on a threading.Event until submit_response
+        (from any thread) sets it or the request times out.
+        """
+        request = self.pending_requests.get(request_id)
+        if not request:
             if request_id in self.responses:
-                response = self.responses[request_id]
-                self._log_event("response_received", {
-                    "request_id": request_id,
-                    "status": response.status.value
-                })
-                return response
-            
-            time.sleep(poll_interval)  # In production: async sleep
-            
-        # Timeout occurred
-        logger.warning(f"Request {request_id} timed out")
-        return self._handle_timeout(request)
+                return self._receive_response(self.responses[request_id])
+            logger.error("Request not found: %s", request_id)
+            return None
+        
+        # Register before checking so a response submitted in between still
+        # finds the event to set
+        event = self._thread_events.setdefault(request_id, threading.Event())
+        try:
+            if request._state == _PENDING:
+                logger.info("Waiting for response on request: %s", request_id)
+                if not event.wait(self._remaining(request)):
+                    return self._expire(request)
+        finally:
+            self._thread_events.pop(request_id, None)
+        
+        return self._receive_response(self.responses[request_id])
+    
+    def _expire(self, request: HITLRequest) -> HITLResponse:
+        """Time a request out once, however many waiters give up on it."""
+        with self._lock:
+            if request._state != _PENDING:
+                # Another waiter already timed it out, or a response won
+                return self.responses[request.request_id]
+            logger.warning("Request %s timed out", request.request_id)
+            return self._handle_timeout(request)
+    
+    @staticmethod
+    def _remaining(request: HITLRequest) -> float:
+        """Seconds left before the request times out (may be negative)."""
+        return request._deadline - time.monotonic()
+    
+    def _receive_response(self, response: HITLResponse) -> HITLResponse:
+        """Record that a waiter picked up a submitted response."""
+        if self._audit_enabled:
+            self._log_event("response_received", {
+                "request_id": response.request_id,
+                "status": _STATUS_VALUE[response.status]
+            })
+        return response
     
     def submit_response(self, response: HITLResponse) -> bool:
-        """Submit a human response to a request."""
-        if response.request_id not in self.pending_requests:
-            logger.error(f"Cannot submit response: request {response.request_id} not found")
-            return False
-        
-        request = self.pending_requests[response.request_id]
+        """
+        Submit a human response to a request.
         
-        if request.is_expired():
-            logger.warning(f"Response submitted after timeout: {response.request_id}")
-            return False
+        Wakes the matching wait_for_response or wait_for_response_blocking.
+        Safe to call from any thread: an async waiter's future is resolved
+        on its own event loop.
+        """
+        with self._lock:
+            request = self.pending_requests.get(response.request_id)
+            if request is None:
+                if response.request_id in self.responses:
+                    logger.warning("Request %s already has a response", response.request_id)
+                else:
+                    logger.error("Cannot submit response: request %s not found", response.request_id)
+                return False
+            
+            if request.is_expired():
+                logger.warning("Response submitted after timeout: %s", response.request_id)
+                return False
+            
+            self._resolve(request, response)
         
-        self.responses[response.request_id] = response
+        if self._audit_enabled:
+            self._log_event("response_submitted", {
+                "request_id": response.request_id,
+                "responder": response.responder_id,
+                "status": _STATUS_VALUE[response.status]
+            })
         
-        self._log_event("response_submitted", {
-            "request_id": response.request_id,
-            "responder": response.responder_id,
-            "status": response.status.value
-        })
+        entry = self._waiters.get(response.request_id)
+        if entry is not None:
+            loop, waiter, _ = entry
+            if _running_loop() is loop:
+                _set_waiter(waiter, response)
+            else:
+                try:
+                    loop.call_soon_threadsafe(_set_waiter, waiter, response)
+                except RuntimeError:
+                    pass  # The waiter's loop has closed; nobody is left waiting
+        thread_event = self._thread_events.get(response.request_id)
+        if thread_event is not None:
+            thread_event.set()
         
-        logger.info(f"Response submitted for request: {response.request_id}")
+        logger.info("Response submitted for request: %s", response.request_id)
         return True
     
     def _handle_timeout(self, request: HITLRequest) -> Optional[HITLResponse]:
-        """Handle request timeout."""
+        """Handle request timeout. Called with self._lock held."""
         if self.escalation_enabled and self.escalation_callback:
             escalation = EscalationResult(
                 reason="timeout",
                 original_request=request,
                 fallback_action="notify_manager"
             )
-            self.escalation_callback(escalation)
+            future = self._escalation_executor.submit(self.escalation_callback, escalation)
+            future.add_done_callback(self._log_escalation_error)
         
         timeout_response = HITLResponse(
             request_id=request.request_id,
@@ -197,25 +394,57 @@ class HITLHandler:
             feedback="Request timed out waiting for human response"
         )
         
-        self._log_event("timeout_occurred", {
-            "request_id": request.request_id,
-            "elapsed_minutes": self.timeout_minutes
-        })
+        self._resolve(request, timeout_response)
+        
+        if self._audit_enabled:
+            self._log_event("timeout_occurred", {
+                "request_id": request.request_id,
+                "elapsed_minutes": self.timeout_minutes
+            })
         
         return timeout_response
     
+    @staticmethod
+    def _log_escalation_error(future: Future):
+        """Report a failed escalation callback, which would otherwise be lost."""
+        error = future.exception()
+        if error is not None:
+            logger.error("Escalation callback failed: %r", error)
+    
+    def _resolve(self, request: HITLRequest, response: HITLResponse):
+        """
+        Move a request from pending to the bounded response history.
+        
+        Called with self._lock held.
+        """
+        # Store before flagging and popping so a waiter that sees either
+        # change finds the response
+        self.responses[response.request_id] = response
+        request._state = (
+            _EXPIRED if response.status is ApprovalStatus.TIMEOUT else _RESPONDED
+        )
+        self.pending_requests.pop(response.request_id, None)
+        if len(self.responses) > self.history_limit:
+            self.responses.popitem(last=False)
+    
+    @property
+    def audit_log_formatted(self) -> List[Dict[str, Any]]:
+        """Audit entries expanded to dicts with an ISO "timestamp"."""
+        return [
+            {"event": event, "timestamp": _ns_to_iso(ts_ns), **data}
+            for event, ts_ns, data in self.audit_log
+        ]
+    
     def _generate_request_id(self) -> str:
         """Generate a unique request ID."""
-        import uuid
-        return f"hitl_{uuid.uuid4().hex[:8]}"
+        return f"hitl_{os.urandom(4).hex()}"
     
     def _log_event(self, event_type: str, data: Dict[str, Any]):
-        """Log an audit event."""
-        self.audit_log.append({
-            "event": event_type,
-            "timestamp": datetime.utcnow().isoformat(),
-            **data
-        })
+        """Log an audit event as an (event, ts_ns, data) tuple."""
+        entry = (event_type, time.time_ns(), data)
+        self.audit_log.append(entry)
+        if self.audit_sink is not None:
+            self.audit_sink(entry)
 
 
 class EmailApprovalWorkflow:
@@ -237,8 +466,16 @@ class EmailApprovalWorkflow:
         )
         self.escalation_email = escalation_email
         self.approved_emails: list = []
+        # Per-status handlers for _process_response; statuses without one
+        # (PENDING, ESCALATED) only get the common result fields
+        self._response_handlers: Dict[ApprovalStatus, Callable] = {
+            ApprovalStatus.APPROVED: self._r_approved,
+            ApprovalStatus.REJECTED: self._r_rejected,
+            ApprovalStatus.MODIFIED: self._r_modified,
+            ApprovalStatus.TIMEOUT: self._r_timeout,
+        }
         
-    def draft_and_send(
+    async def draft_and_send(
         self,
         customer_email: str,
         subject: str,
@@ -257,26 +494,27 @@ class EmailApprovalWorkflow:
         Returns:
             Result dict with status and details
         """
-        # Create HITL request
-        enriched_context = {
-            **(context or {}),
-            "customer_email": customer_email,
-            "subject": subject,
-            "draft_content": draft_content
-        }
+        # Create HITL request; the email fields take precedence over the
+        # caller's context. A shallow copy keeps request.context a plain,
+        # JSON-serializable dict while sharing large values by reference
+        enriched_context = dict(context or ())
+        enriched_context.update(
+            customer_email=customer_email,
+            subject=subject,
+            draft_content=draft_content
+        )
         
         request = self.hitl_handler.create_request(
             draft_content=draft_content,
             context=enriched_context
         )
         
-        logger.info(f"Email draft created for {customer_email}, awaiting approval")
+        logger.info("Email draft created for %s, awaiting approval", customer_email)
         
         # In production, this would trigger actual HITL UI notification
         # For this example, we'll simulate the response
         
-        # Wait for response (in production: async)
-        response = self.hitl_handler.wait_for_response(request.request_id)
+        response = await self.hitl_handler.wait_for_response(request.request_id)
         
         return self._process_response(response, enriched_context)
     
@@ -294,37 +532,64 @@ class EmailApprovalWorkflow:
             }
         
         result = {
-            "status": response.status.value,
+            "status": _STATUS_VALUE[response.status],
             "request_id": response.request_id,
             "customer_email": context["customer_email"],
             "subject": context["subject"]
         }
         
-        if response.status == ApprovalStatus.APPROVED:
-            self._send_email(context)
-            result["message"] = "Email sent successfully"
-            result["content_sent"] = context["draft_content"]
-            
-        elif response.status == ApprovalStatus.REJECTED:
-            result["message"] = "Email rejected by reviewer"
-            result["feedback"] = response.feedback
-            
-        elif response.status == ApprovalStatus.MODIFIED:
-            result["message"] = "Email modified and sent"
-            result["original_content"] = context["draft_content"]
-            result["modified_content"] = response.modified_content
-            self._send_email({**context, "draft_content": response.modified_content})
-            
-        elif response.status == ApprovalStatus.TIMEOUT:
-            result["message"] = "Approval timed out - escalated to manager"
-            result["escalation_email"] = self.escalation_email
-            
+        handler = self._response_handlers.get(response.status)
+        if handler:
+            handler(result, response, context)
         return result
     
+    def _r_approved(
+        self,
+        result: Dict[str, Any],
+        response: HITLResponse,
+        context: Dict[str, Any]
+    ):
+        """Send the draft as written."""
+        self._send_email(context)
+        result["message"] = "Email sent successfully"
+        result["content_sent"] = context["draft_content"]
+    
+    def _r_rejected(
+        self,
+        result: Dict[str, Any],
+        response: HITLResponse,
+        context: Dict[str, Any]
+    ):
+        """Record the reviewer's feedback without sending."""
+        result["message"] = "Email rejected by reviewer"
+        result["feedback"] = response.feedback
+    
+    def _r_modified(
+        self,
+        result: Dict[str, Any],
+        response: HITLResponse,
+        context: Dict[str, Any]
+    ):
+        """Send the reviewer's edited content."""
+        result["message"] = "Email modified and sent"
+        result["original_content"] = context["draft_content"]
+        result["modified_content"] = response.modified_content
+        self._send_email({**context, "draft_content": response.modified_content})
+    
+    def _r_timeout(
+        self,
+        result: Dict[str, Any],
+        response: HITLResponse,
+        context: Dict[str, Any]
+    ):
+        """Report the escalation after a timeout."""
+        result["message"] = "Approval timed out - escalated to manager"
+        result["escalation_email"] = self.escalation_email
+    
     def _send_email(self, context: Dict[str, Any]):
         """Send the approved email (placeholder for actual email service)."""
-        logger.info(f"Sending email to {context['customer_email']}")
-        logger.info(f"Subject: {context['subject']}")
+        logger.info("Sending email to %s", context["customer_email"])
+        logger.info("Subject: %s", context["subject"])
         # In production: integrate with SendGrid, AWS SES, etc.
         self.approved_emails.append({
             "to": context["customer_email"],
@@ -334,66 +599,70 @@ class EmailApprovalWorkflow:
     
     def _escalate_to_manager(self, escalation: EscalationResult):
         """Escalate timeout to manager."""
-        logger.warning(f"Escalating to manager: {self.escalation_email}")
-        logger.warning(f"Reason: {escalation.reason}")
+        logger.warning("Escalating to manager: %s", self.escalation_email)
+        logger.warning("Reason: %s", escalation.reason)
         # In production: send email/Slack notification to manager
 
 
 # Example usage and demonstration
-if __name__ == "__main__":
+async def main():
     # Initialize workflow
     workflow = EmailApprovalWorkflow(
         timeout_minutes=5,
         escalation_email="manager@company.com"
     )
+    handler = workflow.hitl_handler
+    loop = asyncio.get_running_loop()
+    
+    # In production, the response would come from actual human via HITL UI.
+    # Here each new request schedules a simulated reviewer on the running
+    # loop's timer, so no thread or task is created per review.
+    def simulate_review(**response_fields):
+        def on_request_created(request: HITLRequest):
+            loop.call_later(0.5, handler.submit_response, HITLResponse(
+                request_id=request.request_id, **response_fields
+            ))
+        handler.on_request_created = on_request_created
     
     # Example 1: Simulate approved email
     print("=== Example 1: Approved Email ===")
     
-    # In production, the response would come from actual human via HITL UI
-    # Here we simulate by pre-submitting a response
-    def simulate_approval():
-        time.sleep(0.5)  # Small delay to simulate async
-        workflow.hitl_handler.submit_response(HITLResponse(
-            request_id=list(workflow.hitl_handler.pending_requests.keys())[-1],
-            status=ApprovalStatus.APPROVED,
-            responder_id="reviewer_001",
-            feedback="Looks good, approved"
-        ))
-    
-    import threading
-    threading.Thread(target=simulate_approval, daemon=True).start()
-    
-    result = workflow.draft_and_send(
+    simulate_review(
+        status=ApprovalStatus.APPROVED,
+        responder_id="reviewer_001",
+        feedback="Looks good, approved"
+    )
+    
+    result = await workflow.draft_and_send(
         customer_email="customer@example.com",
         subject="Issue Resolution",
         draft_content="Dear customer, we've resolved your issue...",
         context={"urgency": "medium", "ticket_id": "TKT-12345"}
     )
-    print(json.dumps(result, indent=2))
+    print(_dumps(result))
     
     print("\n=== Example 2: Rejected Email ===")
     
-    def simulate_rejection():
-        time.sleep(0.5)
-        workflow.hitl_handler.submit_response(HITLResponse(
-            request_id=list(workflow.hitl_handler.pending_requests.keys())[-1],
-            status=ApprovalStatus.REJECTED,
-            responder_id="reviewer_002",
-            feedback="Please add discount code before sending"
-        ))
-    
-    threading.Thread(target=simulate_rejection, daemon=True).start()
+    simulate_review(
+        status=ApprovalStatus.REJECTED,
+        responder_id="reviewer_002",
+        feedback="Please add discount code before sending"
+    )
     
-    result = workflow.draft_and_send(
+    result = await workflow.draft_and_send(
         customer_email="vip@example.com",
         subject="Special Offer",
         draft_content="Dear VIP customer, check out our new features...",
         context={"urgency": "high", "customer_tier": "VIP"}
     )
-    print(json.dumps(result, indent=2))
+    print(_dumps(result))
     
     # Print audit log
     print("\n=== Audit Log ===")
-    for entry in workflow.hitl_handler.audit_log:
-        print(f"{entry['timestamp']}: {entry['event']}")
+    print(_dumps(handler.audit_log_formatted))
+    handler.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
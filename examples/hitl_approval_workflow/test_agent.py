@@ -2,11 +2,13 @@
 Unit tests for HITL Approval Workflow.
 """
 
+import asyncio
+import json
+import sys
+import threading
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from unittest.mock import Mock, patch
-import time
-import threading
 
 from agent import (
     HITLHandler,
@@ -33,6 +35,8 @@ class TestHITLRequest(unittest.TestCase):
         self.assertEqual(request.draft_content, "Test content")
         self.assertEqual(request.timeout_minutes, 5)
         self.assertFalse(request.is_expired())
+        if sys.version_info >= (3, 10):
+            self.assertFalse(hasattr(request, "__dict__"))
     
     def test_request_expiration(self):
         """Test request expiration logic."""
@@ -41,9 +45,20 @@ class TestHITLRequest(unittest.TestCase):
             draft_content="Test",
             timeout_minutes=0  # Immediate timeout for testing
         )
-        # Manually set created_at to past
-        request.created_at = datetime.utcnow() - timedelta(minutes=1)
         self.assertTrue(request.is_expired())
+        
+        # Expiry runs on a monotonic deadline; created_at is audit-only
+        request = HITLRequest(
+            request_id="test_003",
+            draft_content="Test",
+            timeout_minutes=5
+        )
+        request.created_at -= 600
+        self.assertFalse(request.is_expired())
+        self.assertLess(
+            abs(datetime.utcnow() - timedelta(minutes=10) - request.created_at_dt),
+            timedelta(minutes=1)
+        )
 
 
 class TestHITLHandler(unittest.TestCase):
@@ -61,6 +76,14 @@ class TestHITLHandler(unittest.TestCase):
         )
         self.assertIn(request.request_id, self.handler.pending_requests)
         self.assertEqual(request.draft_content, "Test draft")
+        self.assertRegex(request.request_id, r"^hitl_[0-9a-f]{8}$")
+        self.assertEqual(self.handler.last_request_id, request.request_id)
+    
+    def test_request_creation_is_logged(self):
+        """Test that request creation is logged with the request ID."""
+        with self.assertLogs("agent", level="INFO") as logs:
+            request = self.handler.create_request(draft_content="Test")
+        self.assertEqual(logs.records[0].getMessage(), f"HITL request created: {request.request_id}")
     
     def test_submit_response(self):
         """Test response submission."""
@@ -74,6 +97,30 @@ class TestHITLHandler(unittest.TestCase):
         self.assertTrue(result)
         self.assertIn(request.request_id, self.handler.responses)
     
+    def test_answered_requests_leave_pending(self):
+        """Test that answered requests move to the bounded response history."""
+        handler = HITLHandler(timeout_minutes=5, history_limit=2)
+        requests = [handler.create_request(draft_content="Test") for _ in range(3)]
+        for request in requests:
+            handler.submit_response(HITLResponse(
+                request_id=request.request_id,
+                status=ApprovalStatus.APPROVED
+            ))
+        
+        self.assertEqual(handler.pending_requests, {})
+        self.assertEqual(
+            list(handler.responses),
+            [requests[1].request_id, requests[2].request_id]
+        )
+        self.assertFalse(handler.submit_response(HITLResponse(
+            request_id=requests[2].request_id,
+            status=ApprovalStatus.REJECTED
+        )))
+        self.assertEqual(
+            handler.responses[requests[2].request_id].status,
+            ApprovalStatus.APPROVED
+        )
+    
     def test_submit_response_invalid_request(self):
         """Test submitting response for non-existent request."""
         response = HITLResponse(
@@ -83,11 +130,217 @@ class TestHITLHandler(unittest.TestCase):
         result = self.handler.submit_response(response)
         self.assertFalse(result)
     
+    def test_wait_for_response_wakes_on_submit(self):
+        """Test that a waiting request sees a response as soon as it is submitted."""
+        request = self.handler.create_request(draft_content="Test")
+        
+        async def run():
+            waiter = asyncio.create_task(self.handler.wait_for_response(request.request_id))
+            await asyncio.sleep(0)
+            self.handler.submit_response(HITLResponse(
+                request_id=request.request_id,
+                status=ApprovalStatus.APPROVED
+            ))
+            return await asyncio.wait_for(waiter, 1)
+        
+        response = asyncio.run(run())
+        self.assertEqual(response.status, ApprovalStatus.APPROVED)
+        self.assertEqual(self.handler._waiters, {})
+    
+    def test_wait_for_response_wakes_on_threaded_submit(self):
+        """Test that an async waiter wakes promptly on a response from another thread."""
+        request = self.handler.create_request(draft_content="Test")
+        submitter = threading.Timer(0.05, self.handler.submit_response, [HITLResponse(
+            request_id=request.request_id,
+            status=ApprovalStatus.APPROVED
+        )])
+        
+        async def run():
+            submitter.start()
+            return await asyncio.wait_for(
+                self.handler.wait_for_response(request.request_id), 1
+            )
+        
+        response = asyncio.run(run())
+        submitter.join()
+        self.assertEqual(response.status, ApprovalStatus.APPROVED)
+        self.assertEqual(self.handler._waiters, {})
+    
+    def test_concurrent_waiters_share_response(self):
+        """Test that every waiter on a request receives the submitted response."""
+        request = self.handler.create_request(draft_content="Test")
+        response = HITLResponse(
+            request_id=request.request_id,
+            status=ApprovalStatus.MODIFIED
+        )
+        
+        async def run():
+            waiters = [
+                asyncio.create_task(self.handler.wait_for_response(request.request_id))
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0)
+            self.handler.submit_response(response)
+            return await asyncio.wait_for(asyncio.gather(*waiters), 1)
+        
+        results = asyncio.run(run())
+        self.assertIs(results[0], response)
+        self.assertIs(results[1], response)
+    
+    def test_cancelled_waiter_leaves_others_waiting(self):
+        """Test that cancelling one waiter does not strand the others."""
+        request = self.handler.create_request(draft_content="Test")
+        response = HITLResponse(
+            request_id=request.request_id,
+            status=ApprovalStatus.APPROVED
+        )
+        
+        async def run():
+            cancelled, waiting = [
+                asyncio.create_task(self.handler.wait_for_response(request.request_id))
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            await asyncio.wait([cancelled])
+            self.handler.submit_response(response)
+            return await asyncio.wait_for(waiting, 1)
+        
+        self.assertIs(asyncio.run(run()), response)
+        self.assertEqual(self.handler._waiters, {})
+    
+    def test_wait_for_response_after_submit(self):
+        """Test waiting on a request that already has a response."""
+        request = self.handler.create_request(draft_content="Test")
+        self.handler.submit_response(HITLResponse(
+            request_id=request.request_id,
+            status=ApprovalStatus.REJECTED
+        ))
+        
+        response = asyncio.run(self.handler.wait_for_response(request.request_id))
+        self.assertEqual(response.status, ApprovalStatus.REJECTED)
+        self.assertEqual(self.handler._waiters, {})
+        self.assertEqual(self.handler.audit_log[-1][0], "response_received")
+    
+    def test_wait_for_response_blocking(self):
+        """Test the blocking wait wakes on a response from another thread."""
+        request = self.handler.create_request(draft_content="Test")
+        submitter = threading.Timer(0.05, self.handler.submit_response, [HITLResponse(
+            request_id=request.request_id,
+            status=ApprovalStatus.APPROVED
+        )])
+        submitter.start()
+        
+        response = self.handler.wait_for_response_blocking(request.request_id)
+        submitter.join()
+        self.assertEqual(response.status, ApprovalStatus.APPROVED)
+        self.assertEqual(self.handler._thread_events, {})
+        
+        handler = HITLHandler(timeout_minutes=0)
+        request = handler.create_request(draft_content="Test")
+        self.assertEqual(
+            handler.wait_for_response_blocking(request.request_id).status,
+            ApprovalStatus.TIMEOUT
+        )
+    
+    def test_escalation_runs_off_the_response_path(self):
+        """Test that a timeout returns before the escalation callback finishes."""
+        started = threading.Event()
+        release = threading.Event()
+        escalations = []
+        
+        def slow_escalation(escalation):
+            started.set()
+            release.wait(1)
+            escalations.append(escalation)
+        
+        handler = HITLHandler(timeout_minutes=0, escalation_callback=slow_escalation)
+        request = handler.create_request(draft_content="Test")
+        response = handler.wait_for_response_blocking(request.request_id)
+        
+        self.assertEqual(response.status, ApprovalStatus.TIMEOUT)
+        self.assertTrue(started.wait(1))
+        self.assertEqual(escalations, [])
+        release.set()
+        handler.close()
+        self.assertEqual(len(escalations), 1)
+        self.assertIs(escalations[0].original_request, request)
+    
+    def test_audit_can_be_disabled(self):
+        """Test that a handler with auditing off records no events."""
+        sink = []
+        handler = HITLHandler(audit_enabled=False, audit_sink=sink.append)
+        request = handler.create_request(draft_content="Test")
+        handler.submit_response(HITLResponse(
+            request_id=request.request_id,
+            status=ApprovalStatus.APPROVED
+        ))
+        
+        self.assertEqual(len(handler.audit_log), 0)
+        self.assertEqual(sink, [])
+        self.assertIn(request.request_id, handler.responses)
+    
+    def test_concurrent_timeouts_escalate_once(self):
+        """Test that a request times out once however many waiters give up."""
+        escalations = []
+        handler = HITLHandler(timeout_minutes=0, escalation_callback=escalations.append)
+        request = handler.create_request(draft_content="Test")
+        
+        async def run():
+            return await asyncio.gather(
+                handler.wait_for_response(request.request_id),
+                handler.wait_for_response(request.request_id)
+            )
+        
+        first, second = asyncio.run(run())
+        
+        # Blocking waiters on other threads race for the same timeout
+        threaded = handler.create_request(draft_content="Test")
+        barrier = threading.Barrier(8)
+        
+        def wait():
+            barrier.wait()
+            return handler.wait_for_response_blocking(threaded.request_id)
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            responses = list(pool.map(lambda _: wait(), range(8)))
+        handler.close()
+        
+        self.assertEqual(first.status, ApprovalStatus.TIMEOUT)
+        self.assertIs(second, first)
+        self.assertTrue(all(r is responses[0] for r in responses))
+        self.assertEqual(len(escalations), 2)
+        timeouts = [data for event, _, data in handler.audit_log if event == "timeout_occurred"]
+        self.assertEqual(
+            [data["request_id"] for data in timeouts],
+            [request.request_id, threaded.request_id]
+        )
+    
     def test_audit_logging(self):
         """Test audit log functionality."""
         self.handler.create_request(draft_content="Test")
         self.assertEqual(len(self.handler.audit_log), 1)
-        self.assertEqual(self.handler.audit_log[0]["event"], "request_created")
+        event, ts_ns, data = self.handler.audit_log[0]
+        self.assertEqual(event, "request_created")
+        self.assertIsInstance(ts_ns, int)
+        self.assertEqual(data["timeout"], 5)
+        
+        formatted = self.handler.audit_log_formatted[0]
+        self.assertEqual(formatted["event"], "request_created")
+        self.assertNotIn("ts_ns", formatted)
+        logged_at = datetime.fromisoformat(formatted["timestamp"])
+        self.assertLess(abs(datetime.utcnow() - logged_at), timedelta(minutes=1))
+    
+    def test_audit_log_is_bounded(self):
+        """Test that the audit log keeps recent events and forwards all to the sink."""
+        sink = []
+        handler = HITLHandler(audit_maxlen=2, audit_sink=sink.append)
+        for _ in range(3):
+            handler.create_request(draft_content="Test")
+        
+        self.assertEqual(len(handler.audit_log), 2)
+        self.assertEqual(len(sink), 3)
+        self.assertIs(handler.audit_log[-1], sink[-1])
 
 
 class TestEmailApprovalWorkflow(unittest.TestCase):
@@ -105,26 +358,25 @@ class TestEmailApprovalWorkflow(unittest.TestCase):
         self.assertEqual(self.workflow.escalation_email, "manager@test.com")
         self.assertIsNotNone(self.workflow.hitl_handler)
     
+    def _respond_on_create(self, **response_fields):
+        """Answer each new request inline from the on_request_created hook."""
+        handler = self.workflow.hitl_handler
+        handler.on_request_created = lambda request: handler.submit_response(
+            HITLResponse(request_id=request.request_id, **response_fields)
+        )
+    
     def test_draft_and_send_approved(self):
         """Test email approval workflow - approved case."""
-        # Submit response in background
-        def submit_approval():
-            time.sleep(0.1)
-            pending_ids = list(self.workflow.hitl_handler.pending_requests.keys())
-            if pending_ids:
-                self.workflow.hitl_handler.submit_response(HITLResponse(
-                    request_id=pending_ids[-1],
-                    status=ApprovalStatus.APPROVED,
-                    responder_id="reviewer_001"
-                ))
-        
-        threading.Thread(target=submit_approval, daemon=True).start()
-        
-        result = self.workflow.draft_and_send(
+        self._respond_on_create(
+            status=ApprovalStatus.APPROVED,
+            responder_id="reviewer_001"
+        )
+        
+        result = asyncio.run(self.workflow.draft_and_send(
             customer_email="customer@test.com",
             subject="Test Subject",
             draft_content="Test content"
-        )
+        ))
         
         self.assertEqual(result["status"], "approved")
         self.assertEqual(result["customer_email"], "customer@test.com")
@@ -132,27 +384,71 @@ class TestEmailApprovalWorkflow(unittest.TestCase):
     
     def test_draft_and_send_rejected(self):
         """Test email approval workflow - rejected case."""
-        def submit_rejection():
-            time.sleep(0.1)
-            pending_ids = list(self.workflow.hitl_handler.pending_requests.keys())
-            if pending_ids:
-                self.workflow.hitl_handler.submit_response(HITLResponse(
-                    request_id=pending_ids[-1],
-                    status=ApprovalStatus.REJECTED,
-                    responder_id="reviewer_001",
-                    feedback="Needs revision"
-                ))
-        
-        threading.Thread(target=submit_rejection, daemon=True).start()
-        
-        result = self.workflow.draft_and_send(
+        self._respond_on_create(
+            status=ApprovalStatus.REJECTED,
+            responder_id="reviewer_001",
+            feedback="Needs revision"
+        )
+        
+        result = asyncio.run(self.workflow.draft_and_send(
             customer_email="customer@test.com",
             subject="Test Subject",
             draft_content="Test content"
-        )
+        ))
         
         self.assertEqual(result["status"], "rejected")
         self.assertEqual(result["feedback"], "Needs revision")
+    
+    def test_draft_context_is_layered(self):
+        """Test that the email fields override the caller's context, leaving it untouched."""
+        context = {"ticket_id": "TKT-1", "subject": "stale"}
+        
+        async def run():
+            waiter = asyncio.create_task(self.workflow.draft_and_send(
+                customer_email="customer@test.com",
+                subject="Test Subject",
+                draft_content="Test content",
+                context=context
+            ))
+            await asyncio.sleep(0)
+            request_id = self.workflow.hitl_handler.last_request_id
+            request = self.workflow.hitl_handler.pending_requests[request_id]
+            self.workflow.hitl_handler.submit_response(HITLResponse(
+                request_id=request_id,
+                status=ApprovalStatus.APPROVED
+            ))
+            return request, await waiter
+        
+        request, result = asyncio.run(run())
+        self.assertEqual(request.context["ticket_id"], "TKT-1")
+        self.assertEqual(request.context["subject"], "Test Subject")
+        self.assertEqual(result["subject"], "Test Subject")
+        self.assertEqual(context, {"ticket_id": "TKT-1", "subject": "stale"})
+        self.assertIs(type(request.context), dict)
+        json.dumps(request.context)
+    
+    def test_process_response_modified(self):
+        """Test that a modified response sends the reviewer's content."""
+        context = {
+            "customer_email": "customer@test.com",
+            "subject": "Test Subject",
+            "draft_content": "Original"
+        }
+        result = self.workflow._process_response(HITLResponse(
+            request_id="test_001",
+            status=ApprovalStatus.MODIFIED,
+            modified_content="Edited"
+        ), context)
+        
+        self.assertEqual(result["status"], "modified")
+        self.assertEqual(result["modified_content"], "Edited")
+        self.assertEqual(len(self.workflow.approved_emails), 1)
+        
+        result = self.workflow._process_response(HITLResponse(
+            request_id="test_002",
+            status=ApprovalStatus.ESCALATED
+        ), context)
+        self.assertNotIn("message", result)
 
 
 class TestIntegration(unittest.TestCase):
@@ -166,11 +462,11 @@ class TestIntegration(unittest.TestCase):
             escalation_email="manager@test.com"
         )
         
-        result = workflow.draft_and_send(
+        result = asyncio.run(workflow.draft_and_send(
             customer_email="customer@test.com",
             subject="Test",
             draft_content="Test"
-        )
+        ))
         
         self.assertEqual(result["status"], "timeout")
         self.assertIn("escalation_email", result)
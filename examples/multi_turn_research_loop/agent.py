@@ -12,63 +12,135 @@ This example shows how an agent can:
 Inspired by real-world autonomous agent patterns used in production systems.
 """
 
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional, Callable
-from enum import Enum
+from enum import IntEnum
+import asyncio
+import heapq
 import json
+import logging
+import sys
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 
+logger = logging.getLogger(__name__)
 
-class EvaluationResult(Enum):
+_EPOCH = datetime(1970, 1, 1)
+
+# dataclass(slots=True) needs Python 3.10+; older versions keep __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _ns_to_datetime(ts_ns: int) -> datetime:
+    """Convert epoch nanoseconds to a naive UTC datetime."""
+    return _EPOCH + timedelta(microseconds=ts_ns // 1000)
+
+
+# Display labels, indexed by the IntEnum values below
+_EVALUATION_NAMES = ("sufficient", "needs_more", "insufficient_source", "max_iterations")
+_ACTION_NAMES = ("search", "analyze", "synthesize", "escalate")
+
+
+class EvaluationResult(IntEnum):
     """Result of evaluating research progress."""
-    SUFFICIENT = "sufficient"
-    NEEDS_MORE = "needs_more"
-    INSUFFICIENT_SOURCE = "insufficient_source"
-    MAX_ITERATIONS = "max_iterations"
+    SUFFICIENT = 0
+    NEEDS_MORE = 1
+    INSUFFICIENT_SOURCE = 2
+    MAX_ITERATIONS = 3
+    
+    @property
+    def label(self) -> str:
+        """Lowercase display name, e.g. "needs_more"."""
+        return _EVALUATION_NAMES[self]
 
 
-class ActionType(Enum):
+class ActionType(IntEnum):
     """Types of actions the agent can take."""
-    SEARCH = "search"
-    ANALYZE = "analyze"
-    SYNTHESIZE = "synthesize"
-    ESCALATE = "escalate"
+    SEARCH = 0
+    ANALYZE = 1
+    SYNTHESIZE = 2
+    ESCALATE = 3
+    
+    @property
+    def label(self) -> str:
+        """Lowercase display name, e.g. "search"."""
+        return _ACTION_NAMES[self]
+
+
+# Evaluation outcome keyed by four condition bits:
+# 0b1000 max iterations reached, 0b0100 enough sources collected,
+# 0b0010 batch relevance high, 0b0001 no results after the first turn.
+# Values are (result, reasoning template); templates take have= and want=.
+def _build_eval_table() -> Dict[int, tuple]:
+    table = {}
+    for key in range(16):
+        if key & 0b1000:
+            entry = (EvaluationResult.MAX_ITERATIONS, "Reached maximum iterations")
+        elif key & 0b0110 == 0b0110:
+            entry = (EvaluationResult.SUFFICIENT, "Found {have} high-quality sources")
+        elif key & 0b0001:
+            entry = (EvaluationResult.INSUFFICIENT_SOURCE, "No new information found")
+        else:
+            entry = (EvaluationResult.NEEDS_MORE, "Need more sources (have {have}, want {want})")
+        table[key] = entry
+    return table
 
 
-@dataclass
+EVAL_TABLE = _build_eval_table()
+
+
+@dataclass(**_SLOTS)
 class ResearchQuery:
     """Represents a research query with context."""
     query: str
     context: Dict[str, Any] = field(default_factory=dict)
     max_iterations: int = 5
     min_sources: int = 3
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    # Epoch nanoseconds; the created_at property converts on demand
+    created_at_ns: int = field(default_factory=time.time_ns)
+    
+    @property
+    def created_at(self) -> datetime:
+        """created_at_ns as a naive UTC datetime."""
+        return _ns_to_datetime(self.created_at_ns)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class SearchResult:
     """Represents a single search result."""
     source: str
     content: str
     relevance_score: float
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    # Epoch nanoseconds; the timestamp property converts on demand
+    timestamp_ns: int = field(default_factory=time.time_ns)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    
+    @property
+    def timestamp(self) -> datetime:
+        """timestamp_ns as a naive UTC datetime."""
+        return _ns_to_datetime(self.timestamp_ns)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ResearchIteration:
     """Represents one iteration of the research loop."""
     iteration_number: int
     query: str
     action: ActionType
-    results: List[SearchResult]
+    result_ids: List[int]  # Indexes into the agent's collected_sources
     evaluation: EvaluationResult
     reasoning: str
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    memory: str = ""  # Compact summary of the sources seen so far
+    timestamp_ns: int = field(default_factory=time.time_ns)
+    
+    @property
+    def timestamp(self) -> datetime:
+        """timestamp_ns as a naive UTC datetime."""
+        return _ns_to_datetime(self.timestamp_ns)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ResearchReport:
     """Final research report."""
     original_query: str
@@ -78,7 +150,12 @@ class ResearchReport:
     confidence_score: float
     completion_reason: EvaluationResult
     total_time_seconds: float
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    created_at_ns: int = field(default_factory=time.time_ns)
+    
+    @property
+    def created_at(self) -> datetime:
+        """created_at_ns as a naive UTC datetime."""
+        return _ns_to_datetime(self.created_at_ns)
 
 
 class SearchProvider:
@@ -95,6 +172,19 @@ class SearchProvider:
     def search(self, query: str, context: Dict[str, Any]) -> List[SearchResult]:
         """Execute search and return results."""
         raise NotImplementedError
+    
+    async def asearch(self, query: str, context: Dict[str, Any]) -> List[SearchResult]:
+        """
+        Execute search without blocking the event loop.
+        
+        The default runs the blocking search() in a worker thread; providers
+        with an async client (e.g. httpx.AsyncClient) should override this.
+        """
+        return await asyncio.to_thread(self.search, query, context)
+
+
+# Distinct fallback results MockSearchProvider keeps for reuse
+MOCK_FALLBACK_SIZE = 256
 
 
 class MockSearchProvider(SearchProvider):
@@ -105,24 +195,29 @@ class MockSearchProvider(SearchProvider):
     """
     
     def __init__(self):
+        # One stamp for the whole canned database
+        now_ns = time.time_ns()
         self.mock_db = {
             "AI agent frameworks": [
                 SearchResult(
                     source="tech-blog.com",
                     content="LangChain is a popular framework for building LLM applications",
                     relevance_score=0.9,
+                    timestamp_ns=now_ns,
                     metadata={"author": "Tech Expert", "date": "2026-01-15"}
                 ),
                 SearchResult(
                     source="github.com",
                     content="Hive is a YC-backed framework for multi-agent workflows",
                     relevance_score=0.95,
+                    timestamp_ns=now_ns,
                     metadata={"stars": "6800", "language": "Python"}
                 ),
                 SearchResult(
                     source="documentation.io",
                     content="AutoGPT enables autonomous AI agents with goal-directed behavior",
                     relevance_score=0.85,
+                    timestamp_ns=now_ns,
                     metadata={"version": "0.5.0"}
                 ),
             ],
@@ -131,39 +226,81 @@ class MockSearchProvider(SearchProvider):
                     source="swan-ai.com",
                     content="Swan AI built autonomous GTM systems reaching $1M ARR with 3 people",
                     relevance_score=0.95,
+                    timestamp_ns=now_ns,
                     metadata={"revenue": "$1M ARR", "team_size": 3}
                 ),
                 SearchResult(
                     source="indiehackers.com",
                     content="Constraints force innovation - building without hiring",
                     relevance_score=0.88,
+                    timestamp_ns=now_ns,
                     metadata={"topic": "bootstrapping"}
                 ),
             ],
         }
+        # Lowercased keywords per entry, built once instead of on every search
+        self._index = [
+            (tuple(word.lower() for word in key.split()), value)
+            for key, value in self.mock_db.items()
+        ]
+        # Fallback result per query, reused instead of rebuilt on each miss
+        self._fallback: "OrderedDict[str, SearchResult]" = OrderedDict()
     
     def search(self, query: str, context: Dict[str, Any]) -> List[SearchResult]:
         """Simulate search with mock data."""
         # Simulate API delay
         time.sleep(0.5)
-        
+        return self._match(query)
+    
+    async def asearch(self, query: str, context: Dict[str, Any]) -> List[SearchResult]:
+        """Simulate search with mock data, awaiting the API delay."""
+        await asyncio.sleep(0.5)
+        return self._match(query)
+    
+    def _match(self, query: str) -> List[SearchResult]:
+        """Look up mock results for a query."""
         # Simple keyword matching for demo
         results = []
-        for key, value in self.mock_db.items():
-            if any(word.lower() in query.lower() for word in key.split()):
+        query_lower = query.lower()
+        for words, value in self._index:
+            if any(word in query_lower for word in words):
                 results.extend(value)
         
         # If no specific match, return generic results
         if not results:
-            results = [
-                SearchResult(
-                    source="general-knowledge.com",
-                    content=f"Information about {query}",
-                    relevance_score=0.6
-                )
-            ]
+            results = [self._fallback_result(query)]
         
         return results
+    
+    def _fallback_result(self, query: str) -> SearchResult:
+        """The generic result for a query, shared by repeated lookups."""
+        result = self._fallback.get(query)
+        if result is None:
+            result = SearchResult(
+                source="general-knowledge.com",
+                content=f"Information about {query}",
+                relevance_score=0.6
+            )
+            self._fallback[query] = result
+            if len(self._fallback) > MOCK_FALLBACK_SIZE:
+                self._fallback.popitem(last=False)
+        return result
+
+
+# Lines kept in the rolling memory carried from one iteration to the next
+MEMORY_LINES = 5
+MEMORY_SNIPPET_CHARS = 60
+
+# Most relevant sources considered by MMR selection; keeps it O(N·K)
+MMR_CANDIDATES = 50
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    """Jaccard similarity of two token sets."""
+    if not a or not b:
+        return 0.0
+    inter = len(a & b)
+    return inter / (len(a) + len(b) - inter)
 
 
 class MultiTurnResearchAgent:
@@ -181,38 +318,112 @@ class MultiTurnResearchAgent:
         self,
         search_provider: SearchProvider,
         max_iterations: int = 5,
-        min_confidence: float = 0.7
+        min_confidence: float = 0.7,
+        query_fanout: int = 1,
+        search_cache_size: int = 512,
+        max_concurrency: int = 8
     ):
         self.search_provider = search_provider
         self.max_iterations = max_iterations
         self.min_confidence = min_confidence
+        # Query variants searched concurrently per search iteration
+        self.query_fanout = query_fanout
+        # LRU of provider results shared across runs; 0 disables it
+        self.search_cache_size = search_cache_size
+        self._search_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        # Most provider calls in flight at once. The semaphore is created
+        # per event loop because on Python 3.9 it binds to the loop that
+        # is current when it is built.
+        self.max_concurrency = max_concurrency
+        self._search_semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.reset()
+    
+    def reset(self):
+        """Forget previous runs so the agent can research a new query."""
+        # Fresh lists rather than clear(): earlier reports keep theirs
         self.iterations: List[ResearchIteration] = []
-        self.collected_sources: List[SearchResult] = []
+        self.collected_sources = []
+        self.memory = ""
+    
+    @property
+    def collected_sources(self) -> List[SearchResult]:
+        """Unique sources collected so far, in discovery order."""
+        return self._sources
+    
+    @collected_sources.setter
+    def collected_sources(self, sources: List[SearchResult]):
+        self._sources = list(sources)
+        self._source_index: Dict[str, int] = {}
+        for i, r in enumerate(self._sources):
+            self._source_index.setdefault(r.source, i)
+        # Running total of collected relevance scores, for O(1) confidence
+        self._relevance_sum = sum(r.relevance_score for r in self._sources)
+        # Content tokens per source name, filled in by MMR selection
+        self._token_cache: Dict[str, frozenset] = {}
+    
+    def _add_sources(self, results: List[SearchResult]) -> List[int]:
+        """
+        Append results whose source has not been collected yet.
+        
+        Returns the collected_sources index of every result; a repeated
+        source maps to the entry recorded when it was first seen.
+        """
+        index = self._source_index
+        sources = self._sources
+        ids = []
+        for r in results:
+            i = index.get(r.source)
+            if i is None:
+                i = index[r.source] = len(sources)
+                sources.append(r)
+                self._relevance_sum += r.relevance_score
+            ids.append(i)
+        return ids
+    
+    def iteration_results(self, iteration: ResearchIteration) -> List[SearchResult]:
+        """Resolve an iteration's result_ids against collected_sources."""
+        return [self._sources[i] for i in iteration.result_ids]
     
     def research(self, query: ResearchQuery) -> ResearchReport:
         """
         Execute multi-turn research loop.
         
+        Blocking wrapper around aresearch(); call aresearch() directly from
+        code that already runs an event loop.
+        """
+        return asyncio.run(self.aresearch(query))
+    
+    async def aresearch(self, query: ResearchQuery) -> ResearchReport:
+        """
+        Execute multi-turn research loop.
+        
         Pattern: Think → Act → Evaluate → Repeat
         """
-        start_time = time.time()
+        start_ns = time.time_ns()
+        self.reset()
         
         current_query = query.query
         
         for iteration_num in range(1, query.max_iterations + 1):
+            now_ns = time.time_ns()
+            
             # THINK: Decide action based on current state
             action = self._decide_action(iteration_num, current_query)
             
             # ACT: Execute the decided action
             if action == ActionType.SEARCH:
-                results = self._execute_search(current_query, query.context)
+                results = await self._execute_searches(
+                    self._generate_query_variants(current_query, self.query_fanout),
+                    query.context
+                )
             elif action == ActionType.ANALYZE:
                 results = self._analyze_collected()
             elif action == ActionType.SYNTHESIZE:
                 break  # Exit loop to synthesize
             elif action == ActionType.ESCALATE:
                 return self._create_escalation_report(
-                    query, iteration_num, start_time
+                    query, iteration_num, start_ns
                 )
             
             # EVALUATE: Assess progress and decide next step
@@ -220,22 +431,29 @@ class MultiTurnResearchAgent:
                 iteration_num, results, query
             )
             
+            # Store unique sources; the iteration keeps only their ids
+            if action == ActionType.ANALYZE:
+                result_ids = list(range(len(results)))
+            else:
+                first_new = len(self._sources)
+                result_ids = self._add_sources(results)
+                self.memory = self._compact_memory(
+                    self.memory, self._sources[first_new:]
+                )
+            
             # Record iteration
             iteration = ResearchIteration(
                 iteration_number=iteration_num,
                 query=current_query,
                 action=action,
-                results=results,
+                result_ids=result_ids,
                 evaluation=evaluation,
-                reasoning=reasoning
+                reasoning=reasoning,
+                memory=self.memory,
+                timestamp_ns=now_ns
             )
             self.iterations.append(iteration)
             
-            # Store unique sources
-            for result in results:
-                if not any(r.source == result.source for r in self.collected_sources):
-                    self.collected_sources.append(result)
-            
             # Check stopping conditions
             if evaluation == EvaluationResult.SUFFICIENT:
                 break
@@ -249,7 +467,7 @@ class MultiTurnResearchAgent:
         synthesis = self._synthesize_results(query)
         confidence = self._calculate_confidence()
         
-        total_time = time.time() - start_time
+        end_ns = time.time_ns()
         
         return ResearchReport(
             original_query=query.query,
@@ -258,7 +476,8 @@ class MultiTurnResearchAgent:
             synthesis=synthesis,
             confidence_score=confidence,
             completion_reason=evaluation,
-            total_time_seconds=total_time
+            total_time_seconds=(end_ns - start_ns) / 1e9,
+            created_at_ns=end_ns
         )
     
     def _decide_action(self, iteration_num: int, query: str) -> ActionType:
@@ -273,14 +492,71 @@ class MultiTurnResearchAgent:
             # In real implementation, this would use LLM reasoning
             return ActionType.SEARCH
     
-    def _execute_search(
+    async def _execute_search(
         self,
         query: str,
         context: Dict[str, Any]
     ) -> List[SearchResult]:
-        """Execute search query."""
-        print(f"🔍 Searching: {query}")
-        return self.search_provider.search(query, context)
+        """Execute search query, answering repeats from the LRU cache."""
+        key = self._search_cache_key(query, context)
+        cache = self._search_cache
+        if key is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                cache.move_to_end(key)
+                logger.debug("Search cache hit: %s", query)
+                return list(cached)
+        
+        logger.info("🔍 Searching: %s", query)
+        async with self._provider_slot():
+            results = await self.search_provider.asearch(query, context)
+        
+        if key is not None and self.search_cache_size > 0:
+            cache[key] = tuple(results)
+            if len(cache) > self.search_cache_size:
+                cache.popitem(last=False)
+        return results
+    
+    def _provider_slot(self) -> asyncio.Semaphore:
+        """The semaphore bounding provider calls on the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._search_semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._search_semaphore
+    
+    @staticmethod
+    def _search_cache_key(query: str, context: Dict[str, Any]) -> Optional[tuple]:
+        """
+        Cache key for a search: whitespace- and case-normalized query plus
+        the sorted context items. None when the context cannot be hashed.
+        """
+        try:
+            key = (" ".join(query.lower().split()), tuple(sorted(context.items())))
+            hash(key)
+        except TypeError:
+            return None
+        return key
+    
+    async def _execute_searches(
+        self,
+        queries: List[str],
+        context: Dict[str, Any]
+    ) -> List[SearchResult]:
+        """Run several queries concurrently and pool their results in order."""
+        if len(queries) == 1:
+            return await self._execute_search(queries[0], context)
+        batches = await asyncio.gather(
+            *[self._execute_search(q, context) for q in queries]
+        )
+        return [result for batch in batches for result in batch]
+    
+    def _generate_query_variants(self, query: str, k: int) -> List[str]:
+        """The query followed by k - 1 successive refinements of it."""
+        variants = [query]
+        for _ in range(k - 1):
+            variants.append(self._refine_query(variants[-1], []))
+        return variants
     
     def _analyze_collected(self) -> List[SearchResult]:
         """Analyze already collected sources."""
@@ -299,22 +575,42 @@ class MultiTurnResearchAgent:
         Returns:
             (EvaluationResult, reasoning)
         """
-        # Check max iterations
-        if iteration_num >= query.max_iterations:
-            return EvaluationResult.MAX_ITERATIONS, "Reached maximum iterations"
-        
-        # Check number of sources
-        if len(self.collected_sources) >= query.min_sources:
-            # Check average relevance
-            avg_relevance = sum(r.relevance_score for r in results) / len(results)
-            if avg_relevance >= 0.8:
-                return EvaluationResult.SUFFICIENT, f"Found {len(self.collected_sources)} high-quality sources"
-        
-        # Check if we're making progress
-        if iteration_num > 1 and len(results) == 0:
-            return EvaluationResult.INSUFFICIENT_SOURCE, "No new information found"
+        have = len(self.collected_sources)
+        enough = have >= query.min_sources
+        # Average relevance only matters once there are enough sources
+        high_relevance = enough and bool(results) and (
+            sum(r.relevance_score for r in results) / len(results) >= 0.8
+        )
+        key = (
+            (iteration_num >= query.max_iterations) << 3
+            | enough << 2
+            | high_relevance << 1
+            | (iteration_num > 1 and not results)
+        )
+        evaluation, reasoning = EVAL_TABLE[key]
+        return evaluation, reasoning.format(have=have, want=query.min_sources)
+    
+    def _compact_memory(
+        self,
+        prev_memory: str,
+        new_results: List[SearchResult]
+    ) -> str:
+        """
+        Fold newly collected sources into the rolling memory.
         
-        return EvaluationResult.NEEDS_MORE, f"Need more sources (have {len(self.collected_sources)}, want {query.min_sources})"
+        Keeps the latest MEMORY_LINES "source (score): snippet" lines, so
+        the memory (and any prompt built from it) stays the same size no
+        matter how many iterations have run.
+        """
+        if not new_results:
+            return prev_memory
+        lines = prev_memory.splitlines() if prev_memory else []
+        for r in new_results:
+            lines.append(
+                f"{r.source} ({r.relevance_score:.2f}): "
+                f"{r.content[:MEMORY_SNIPPET_CHARS]}"
+            )
+        return "\n".join(lines[-MEMORY_LINES:])
     
     def _refine_query(self, current_query: str, results: List[SearchResult]) -> str:
         """Refine query based on previous results."""
@@ -324,19 +620,67 @@ class MultiTurnResearchAgent:
     def _synthesize_results(self, query: ResearchQuery) -> str:
         """Synthesize all collected information into a coherent report."""
         # In real implementation, this would use LLM to synthesize
-        synthesis = f"""
+        parts = [f"""
 Research Summary for: {query.query}
 
 Sources Consulted: {len(self.collected_sources)}
 Iterations: {len(self.iterations)}
 
 Key Findings:
-"""
-        for i, source in enumerate(self.collected_sources[:5], 1):
-            synthesis += f"\n{i}. {source.source} (relevance: {source.relevance_score:.2f})"
-            synthesis += f"\n   {source.content[:100]}..."
+"""]
+        for i, source in enumerate(self._select_mmr(self.collected_sources), 1):
+            parts.append(f"\n{i}. {source.source} (relevance: {source.relevance_score:.2f})")
+            parts.append(f"\n   {source.content[:100]}...")
+        
+        return "".join(parts)
+    
+    def _content_tokens(self, result: SearchResult) -> frozenset:
+        """Lowercased content tokens of a collected source, computed once."""
+        tokens = self._token_cache.get(result.source)
+        if tokens is None:
+            tokens = frozenset(result.content.lower().split())
+            self._token_cache[result.source] = tokens
+        return tokens
+    
+    def _select_mmr(
+        self,
+        sources: List[SearchResult],
+        k: int = 5,
+        lambda_: float = 0.7
+    ) -> List[SearchResult]:
+        """
+        Pick up to k sources by Maximal Marginal Relevance.
         
-        return synthesis
+        Each step takes the candidate maximizing
+        lambda_ * relevance - (1 - lambda_) * max Jaccard similarity to the
+        sources already picked, so near-duplicates from different turns do
+        not crowd out the rest. Only the MMR_CANDIDATES most relevant
+        sources are considered.
+        """
+        if len(sources) > MMR_CANDIDATES:
+            candidates = heapq.nlargest(
+                MMR_CANDIDATES, sources, key=lambda r: r.relevance_score
+            )
+        else:
+            candidates = list(sources)
+        tokens = [self._content_tokens(r) for r in candidates]
+        max_sim = [0.0] * len(candidates)
+        remaining = list(range(len(candidates)))
+        selected = []
+        while remaining and len(selected) < k:
+            best = max(
+                remaining,
+                key=lambda i: lambda_ * candidates[i].relevance_score
+                - (1 - lambda_) * max_sim[i]
+            )
+            remaining.remove(best)
+            selected.append(candidates[best])
+            chosen = tokens[best]
+            for i in remaining:
+                sim = _jaccard(tokens[i], chosen)
+                if sim > max_sim[i]:
+                    max_sim[i] = sim
+        return selected
     
     def _calculate_confidence(self) -> float:
         """Calculate overall confidence score."""
@@ -344,7 +688,7 @@ Key Findings:
             return 0.0
         
         # Factor in: number of sources, average relevance, diversity
-        avg_relevance = sum(s.relevance_score for s in self.collected_sources) / len(self.collected_sources)
+        avg_relevance = self._relevance_sum / len(self._sources)
         source_count_factor = min(len(self.collected_sources) / 5, 1.0)  # Max at 5 sources
         
         return (avg_relevance * 0.6) + (source_count_factor * 0.4)
@@ -353,9 +697,10 @@ Key Findings:
         self,
         query: ResearchQuery,
         iteration_num: int,
-        start_time: float
+        start_ns: int
     ) -> ResearchReport:
         """Create report when escalation is needed."""
+        end_ns = time.time_ns()
         return ResearchReport(
             original_query=query.query,
             iterations=self.iterations,
@@ -363,10 +708,20 @@ Key Findings:
             synthesis="Escalation required - unable to complete research autonomously",
             confidence_score=0.0,
             completion_reason=EvaluationResult.INSUFFICIENT_SOURCE,
-            total_time_seconds=time.time() - start_time
+            total_time_seconds=(end_ns - start_ns) / 1e9,
+            created_at_ns=end_ns
         )
 
 
+def configure_logging(level: int = logging.INFO):
+    """Print this module's log records to stdout as bare messages."""
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+    logger.setLevel(level)
+
+
 # Example usage
 def demo():
     """Demonstrate the multi-turn research loop."""
@@ -401,17 +756,17 @@ def demo():
     print(f"Total Time: {report.total_time_seconds:.2f}s")
     print(f"Iterations: {len(report.iterations)}")
     print(f"Sources: {len(report.sources)}")
-    print(f"Completion Reason: {report.completion_reason.value}")
+    print(f"Completion Reason: {report.completion_reason.label}")
     
     print("\n" + "-" * 60)
     print("Iteration Details:")
     print("-" * 60)
     for iteration in report.iterations:
         print(f"\nIteration {iteration.iteration_number}:")
-        print(f"  Action: {iteration.action.value}")
+        print(f"  Action: {iteration.action.label}")
         print(f"  Query: {iteration.query}")
-        print(f"  Results: {len(iteration.results)} sources")
-        print(f"  Evaluation: {iteration.evaluation.value}")
+        print(f"  Results: {len(iteration.result_ids)} sources")
+        print(f"  Evaluation: {iteration.evaluation.label}")
         print(f"  Reasoning: {iteration.reasoning}")
     
     print("\n" + "-" * 60)
@@ -423,4 +778,5 @@ def demo():
 
 
 if __name__ == "__main__":
+    configure_logging()
     demo()
@@ -2,9 +2,12 @@
 Unit tests for Multi-Turn Research Loop.
 """
 
+import asyncio
+import sys
+import time
 import unittest
 from unittest.mock import Mock, MagicMock
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from agent import (
     MultiTurnResearchAgent,
@@ -13,7 +16,8 @@ from agent import (
     ResearchIteration,
     EvaluationResult,
     ActionType,
-    MockSearchProvider
+    MockSearchProvider,
+    SearchProvider
 )
 
 
@@ -30,6 +34,31 @@ class TestResearchQuery(unittest.TestCase):
         self.assertEqual(query.query, "test query")
         self.assertEqual(query.max_iterations, 5)
         self.assertEqual(query.min_sources, 3)
+        if sys.version_info >= (3, 10):
+            self.assertFalse(hasattr(query, "__dict__"))
+    
+    def test_timestamps_are_epoch_ns(self):
+        """Test that timestamps are stored as ints and convert to datetimes."""
+        query = ResearchQuery(query="test query")
+        result = SearchResult("s", "c", 0.5, timestamp_ns=0)
+        
+        self.assertIsInstance(query.created_at_ns, int)
+        self.assertLess(abs(query.created_at - datetime.utcnow()), timedelta(minutes=1))
+        self.assertEqual(result.timestamp, datetime(1970, 1, 1))
+
+
+class TestEnums(unittest.TestCase):
+    """Test the integer action and evaluation enums."""
+    
+    def test_labels(self):
+        """Test that the enums compare as ints and keep their display names."""
+        self.assertEqual(ActionType.SEARCH, 0)
+        self.assertEqual(ActionType.SYNTHESIZE.label, "synthesize")
+        self.assertEqual(EvaluationResult.NEEDS_MORE.label, "needs_more")
+        self.assertEqual(
+            [e.label for e in EvaluationResult],
+            ["sufficient", "needs_more", "insufficient_source", "max_iterations"]
+        )
 
 
 class TestMockSearchProvider(unittest.TestCase):
@@ -49,6 +78,40 @@ class TestMockSearchProvider(unittest.TestCase):
         for result in results:
             self.assertGreaterEqual(result.relevance_score, 0.0)
             self.assertLessEqual(result.relevance_score, 1.0)
+    
+    def test_keyword_matching(self):
+        """Test case-insensitive keyword matching and the generic fallback."""
+        results = self.provider._match("Which AGENTS are popular?")
+        self.assertIn("github.com", [r.source for r in results])
+        
+        results = self.provider._match("gardening tips")
+        self.assertEqual([r.source for r in results], ["general-knowledge.com"])
+        self.assertIs(self.provider._match("gardening tips")[0], results[0])
+    
+    def test_async_searches_overlap(self):
+        """Test that concurrent asearch calls overlap their latency."""
+        async def run():
+            return await asyncio.gather(
+                self.provider.asearch("AI agent frameworks", {}),
+                self.provider.asearch("autonomous business", {})
+            )
+        
+        start = time.perf_counter()
+        first, second = asyncio.run(run())
+        elapsed = time.perf_counter() - start
+        
+        self.assertEqual(first, self.provider.search("AI agent frameworks", {}))
+        self.assertEqual(len(second), 2)
+        self.assertLess(elapsed, 0.9)
+    
+    def test_default_asearch_runs_sync_search(self):
+        """Test that providers with only search() still work asynchronously."""
+        class SyncProvider(SearchProvider):
+            def search(self, query, context):
+                return [SearchResult("sync.com", query, 0.7)]
+        
+        results = asyncio.run(SyncProvider().asearch("q", {}))
+        self.assertEqual(results[0].content, "q")
 
 
 class TestMultiTurnResearchAgent(unittest.TestCase):
@@ -95,6 +158,114 @@ class TestMultiTurnResearchAgent(unittest.TestCase):
         self.assertGreaterEqual(report.confidence_score, 0.0)
         self.assertLessEqual(report.confidence_score, 1.0)
     
+    def test_query_fanout_searches_concurrently(self):
+        """Test that fanned-out query variants are searched in one round trip."""
+        agent = MultiTurnResearchAgent(self.search_provider, query_fanout=3)
+        query = ResearchQuery(
+            query="AI agent frameworks",
+            max_iterations=1,
+            min_sources=1
+        )
+        
+        start = time.perf_counter()
+        report = agent.research(query)
+        elapsed = time.perf_counter() - start
+        
+        self.assertLess(elapsed, 0.9)
+        self.assertEqual(len(report.iterations), 1)
+        self.assertEqual(report.iterations[0].result_ids, [0, 1, 2] * 3)
+        self.assertEqual(len(report.sources), 3)
+        self.assertEqual(
+            agent._generate_query_variants("q", 3),
+            ["q", "q best practices 2026", "q best practices 2026 best practices 2026"]
+        )
+    
+    def test_sources_are_deduplicated_per_run(self):
+        """Test that sources are unique and a new run starts from scratch."""
+        query = ResearchQuery(
+            query="AI agent frameworks",
+            max_iterations=2,
+            min_sources=10
+        )
+        
+        first = self.agent.research(query)
+        sources = [r.source for r in first.sources]
+        self.assertEqual(len(sources), len(set(sources)))
+        
+        second = self.agent.research(query)
+        self.assertEqual(len(second.sources), len(first.sources))
+        self.assertIsNot(second.sources, first.sources)
+        self.assertEqual(len(second.iterations), len(first.iterations))
+    
+    def test_iterations_keep_ids_and_bounded_memory(self):
+        """Test that iterations reference pooled sources and memory stays small."""
+        query = ResearchQuery(
+            query="AI agent frameworks",
+            max_iterations=5,
+            min_sources=10
+        )
+        
+        report = self.agent.research(query)
+        
+        for iteration in report.iterations:
+            results = self.agent.iteration_results(iteration)
+            self.assertTrue(all(r in report.sources for r in results))
+            self.assertLessEqual(len(iteration.memory.splitlines()), 5)
+        self.assertIn("github.com (0.95): Hive", report.iterations[0].memory)
+    
+    def test_searches_are_logged(self):
+        """Test that searches are reported through the module logger."""
+        query = ResearchQuery(query="AI agent frameworks", max_iterations=1)
+        
+        with self.assertLogs("agent", level="INFO") as logs:
+            self.agent.research(query)
+        
+        self.assertEqual(logs.output, ["INFO:agent:🔍 Searching: AI agent frameworks"])
+    
+    def test_repeated_searches_use_cache(self):
+        """Test that repeated queries are answered from the search cache."""
+        calls = []
+        
+        class CountingProvider(SearchProvider):
+            def search(self, query, context):
+                calls.append(query)
+                return [SearchResult(query, "c", 0.5)]
+        
+        agent = MultiTurnResearchAgent(CountingProvider())
+        
+        first = asyncio.run(agent._execute_search("AI agent frameworks", {"k": 1}))
+        second = asyncio.run(agent._execute_search("  ai AGENT frameworks ", {"k": 1}))
+        asyncio.run(agent._execute_search("AI agent frameworks", {"k": [1]}))
+        asyncio.run(agent._execute_search("AI agent frameworks", {"k": [1]}))
+        
+        self.assertEqual(second, first)
+        self.assertIsNot(second, first)
+        self.assertEqual(len(calls), 3)
+    
+    def test_provider_calls_are_bounded(self):
+        """Test that max_concurrency caps provider calls in flight."""
+        in_flight = []
+        peak = []
+        
+        class TrackingProvider(SearchProvider):
+            async def asearch(self, query, context):
+                in_flight.append(query)
+                peak.append(len(in_flight))
+                await asyncio.sleep(0.05)
+                in_flight.remove(query)
+                return [SearchResult(query, "c", 0.5)]
+        
+        agent = MultiTurnResearchAgent(
+            TrackingProvider(), query_fanout=5, max_concurrency=2
+        )
+        query = ResearchQuery(query="q", max_iterations=1)
+        
+        agent.research(query)
+        agent.research(ResearchQuery(query="other", max_iterations=1))
+        
+        self.assertEqual(len(peak), 10)
+        self.assertEqual(max(peak), 2)
+    
     def test_max_iterations_enforced(self):
         """Test that max iterations is enforced."""
         query = ResearchQuery(
@@ -140,6 +311,58 @@ class TestEvaluationLogic(unittest.TestCase):
         evaluation, _ = self.agent._evaluate_progress(1, results, query)
         
         self.assertEqual(evaluation, EvaluationResult.NEEDS_MORE)
+    
+    def test_evaluation_precedence(self):
+        """Test the evaluation table, including an empty batch with enough sources."""
+        self.agent.collected_sources = [
+            SearchResult(f"s{i}", "content", 0.9) for i in range(3)
+        ]
+        query = ResearchQuery(query="test", max_iterations=3, min_sources=3)
+        high = [SearchResult("s", "c", 0.9)]
+        
+        self.assertEqual(
+            self.agent._evaluate_progress(3, high, query),
+            (EvaluationResult.MAX_ITERATIONS, "Reached maximum iterations")
+        )
+        self.assertEqual(
+            self.agent._evaluate_progress(2, high, query),
+            (EvaluationResult.SUFFICIENT, "Found 3 high-quality sources")
+        )
+        self.assertEqual(
+            self.agent._evaluate_progress(2, [], query),
+            (EvaluationResult.INSUFFICIENT_SOURCE, "No new information found")
+        )
+        self.assertEqual(
+            self.agent._evaluate_progress(1, [], query),
+            (EvaluationResult.NEEDS_MORE, "Need more sources (have 3, want 3)")
+        )
+    
+    def test_confidence_tracks_collected_scores(self):
+        """Test that confidence uses the scores of every unique source."""
+        self.agent.collected_sources = [SearchResult("s0", "c", 0.5)]
+        self.agent._add_sources(
+            [SearchResult(f"s{i}", "c", 1.0) for i in range(40)]
+        )
+        
+        self.assertEqual(len(self.agent.collected_sources), 40)
+        self.assertAlmostEqual(
+            self.agent._calculate_confidence(),
+            (39 + 0.5) / 40 * 0.6 + 0.4
+        )
+    
+    def test_mmr_skips_near_duplicates(self):
+        """Test that MMR prefers a diverse source over a near-duplicate."""
+        sources = [
+            SearchResult("a", "alpha beta gamma", 0.9),
+            SearchResult("a-mirror", "Alpha beta gamma", 0.89),
+            SearchResult("b", "delta epsilon", 0.7),
+        ]
+        self.agent.collected_sources = sources
+        
+        selected = self.agent._select_mmr(sources, k=2)
+        
+        self.assertEqual([r.source for r in selected], ["a", "b"])
+        self.assertEqual(len(self.agent._select_mmr(sources, k=5)), 3)
 
 
 class TestIntegration(unittest.TestCase):